@@ -1,22 +1,13 @@
-import requests
 import streamlit as st
 from streamlit_lottie import st_lottie
 from PIL import Image
 
+from fitsphere.assets import get_lottie_assets
+from fitsphere.detectors import warm_up_in_background
+
 # ---- CONFIGURE PAGE ----
 st.set_page_config(page_title="FitSphere AI", page_icon="💪", layout="wide")
 
-# ---- FUNCTION TO LOAD LOTTIE FILES ----
-def load_lottieurl(url):
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
-    except:
-        return None
-
 # ---- FUNCTION TO APPLY LOCAL CSS ----
 def local_css(file_name):
     with open(file_name) as f:
@@ -24,11 +15,17 @@ def local_css(file_name):
 
 local_css("./styles/styles.css")  # Path to the CSS file
 
+# ---- WARM UP POSE DETECTORS ----
+# Loads the MediaPipe graph in the background so the first training session starts instantly.
+warm_up_in_background()
+
 # ---- LOAD ASSETS ----
-lottie_coding = load_lottieurl("https://assets10.lottiefiles.com/packages/lf20_FYx0Ph.json")
-music = load_lottieurl("https://assets5.lottiefiles.com/packages/lf20_ikk4jhps.json")
-podcast = load_lottieurl("https://assets8.lottiefiles.com/packages/lf20_JjpNLdaKYX.json")
-hero_animation = load_lottieurl("https://assets3.lottiefiles.com/packages/lf20_tutdw4n3.json")  # Updated working URL
+# Lottie files read once per process and served from memory; any not vendored are fetched once (see fitsphere.assets).
+assets = get_lottie_assets()
+lottie_coding = assets.get("coding")
+music = assets.get("music")
+podcast = assets.get("podcast")
+hero_animation = assets.get("hero")
 logo_path = "./images/logo.png"  # Path to the logo file
 
 # ---- HEADER SECTION ----
@@ -0,0 +1 @@
+"""Shared, Streamlit-independent building blocks used by the FitSphere AI pages."""
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+# ---- Adaptive Quality Controller ----
+class AdaptiveController:
+    """Trades inference resolution, then frame skipping, for frame rate.
+
+    Quality levels run from full resolution with no skipping down to the smallest
+    scale while inferring only every ``max_skip + 1``-th frame. The controller tracks
+    the amortized inference cost per delivered frame -- inference time divided by the
+    frames that actually reached ``should_infer`` since the previous inference, so frames
+    the drop-oldest queue discarded upstream are never counted as skipped -- and steps
+    one level down when it exceeds the frame budget, or one level up when there is
+    ample headroom.
+    """
+
+    def __init__(self, target_fps=15, scales=(1.0, 0.75, 0.5), max_skip=2, alpha=0.2, cooldown=10):
+        self.budget = 1.0 / target_fps
+        self.levels = [(scale, 0) for scale in scales]
+        self.levels += [(scales[-1], skip) for skip in range(1, max_skip + 1)]
+        self.alpha = alpha
+        self.cooldown = cooldown
+        self.level = 0
+        self.frame_cost = None
+        self._frame_index = 0
+        self._delivered = 0  # frames seen by should_infer since the last recorded inference
+        self._since_change = 0
+
+    @property
+    def scale(self):
+        return self.levels[self.level][0]
+
+    @property
+    def skip(self):
+        return self.levels[self.level][1]
+
+    def should_infer(self):
+        """Call once per frame delivered to inference; False means the frame should be skipped."""
+        infer = self._frame_index % (self.skip + 1) == 0
+        self._frame_index += 1
+        self._delivered += 1
+        return infer
+
+    def record(self, seconds):
+        """Feed back the wall time of one inference call."""
+        cost = seconds / max(self._delivered, 1)
+        self._delivered = 0
+        self.frame_cost = cost if self.frame_cost is None else self.frame_cost + self.alpha * (cost - self.frame_cost)
+        self._since_change += 1
+        if self._since_change < self.cooldown:
+            return
+
+        if self.frame_cost > self.budget and self.level < len(self.levels) - 1:
+            self._change_level(1)
+        elif self.frame_cost < 0.5 * self.budget and self.level > 0:
+            self._change_level(-1)
+
+    def _change_level(self, step):
+        old_scale, old_skip = self.levels[self.level]
+        self.level += step
+        new_scale, new_skip = self.levels[self.level]
+        # Re-estimate the per-frame cost for the new level so the next decision waits for fresh data.
+        self.frame_cost *= (new_scale / old_scale) ** 2 * (old_skip + 1) / (new_skip + 1)
+        self._frame_index = 0
+        self._since_change = 0
+
+
+# ---- Skipped Frame Interpolation ----
+class SkipInterpolator:
+    """Fills in joint angles for skipped frames so the rep state machine sees every frame.
+
+    Skipped frames are queued until the next inferred frame arrives; ``inferred`` then
+    returns linearly interpolated angle vectors for the skipped frames followed by the
+    new angles, in frame order.
+    """
+
+    def __init__(self):
+        self.last = None
+        self.pending = 0
+
+    def skipped(self):
+        self.pending += 1
+
+    def inferred(self, angles):
+        if angles is None:
+            # Lost the pose: nothing sensible to interpolate towards.
+            self.last = None
+            self.pending = 0
+            return []
+
+        current = np.array(angles, dtype=np.float64)
+        if self.last is None or self.pending == 0:
+            batch = [current]
+        else:
+            steps = np.arange(1, self.pending + 2)[:, None] / (self.pending + 1)
+            batch = list(self.last + steps * (current - self.last))
+        self.last = current
+        self.pending = 0
+        return batch
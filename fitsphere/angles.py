@@ -0,0 +1,89 @@
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+# MediaPipe landmark triples (a, vertex, c) for every joint an exercise may track.
+JOINTS = {
+    "left_elbow": (11, 13, 15),
+    "right_elbow": (12, 14, 16),
+    "left_shoulder": (13, 11, 23),
+    "right_shoulder": (14, 12, 24),
+    "left_hip": (11, 23, 25),
+    "right_hip": (12, 24, 26),
+    "left_knee": (23, 25, 27),
+    "right_knee": (24, 26, 28),
+}
+
+
+# ---- Landmark Conversion ----
+def landmarks_to_array(lmlist, out=None):
+    """Convert cvzone's ``[[id, x, y, z], ...]`` list into a ``(33, 3)`` float array.
+
+    Returns None when no pose was detected. Pass ``out`` to reuse a buffer across frames.
+    """
+    if not lmlist:
+        return None
+    if out is None:
+        out = np.zeros((NUM_LANDMARKS, 3), dtype=np.float64)
+    rows = np.asarray(lmlist[:NUM_LANDMARKS], dtype=np.float64)
+    n = len(rows)
+    out[:n, :2] = rows[:, 1:3]
+    out[:n, 2] = rows[:, 3] if rows.shape[1] > 3 else 0.0
+    return out
+
+
+# ---- Angle Engine ----
+class AngleEngine:
+    """Computes all tracked joint angles for one pose in a single vectorized pass.
+
+    Angles use the same convention as the original per-joint finder,
+    ``|atan2(c - b) - atan2(a - b)|`` in degrees over the x/y image coordinates,
+    so existing thresholds keep their meaning. ``compute`` writes into, and returns,
+    a buffer that is reused across calls; copy it if a frame's angles must be kept.
+    """
+
+    def __init__(self, joints=JOINTS):
+        self.names = list(joints)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._by_triple = {tuple(triple): i for i, triple in enumerate(joints.values())}
+        triples = np.array(list(joints.values()), dtype=np.intp)
+        self._a, self._b, self._c = triples[:, 0], triples[:, 1], triples[:, 2]
+
+        n = len(self.names)
+        self._pa = np.empty((n, 3))
+        self._pb = np.empty((n, 3))
+        self._pc = np.empty((n, 3))
+        self._theta = np.empty((n, 2))
+        self.angles = np.full(n, np.nan)
+        self._landmarks = np.zeros((NUM_LANDMARKS, 3))
+
+    def index(self, joint):
+        """Position of ``joint`` (a name or a landmark triple) in the angle buffer."""
+        if isinstance(joint, str):
+            return self._index[joint]
+        return self._by_triple[tuple(joint)]
+
+    def compute(self, landmarks):
+        """Fill the angle buffer from a ``(33, 3)`` array or a cvzone landmark list.
+
+        Returns None when no pose was detected.
+        """
+        if not isinstance(landmarks, np.ndarray):
+            landmarks = landmarks_to_array(landmarks, out=self._landmarks)
+            if landmarks is None:
+                return None
+        elif landmarks.dtype != self._landmarks.dtype:
+            np.copyto(self._landmarks, landmarks)
+            landmarks = self._landmarks
+
+        np.take(landmarks, self._a, axis=0, out=self._pa, mode="clip")
+        np.take(landmarks, self._b, axis=0, out=self._pb, mode="clip")
+        np.take(landmarks, self._c, axis=0, out=self._pc, mode="clip")
+        np.subtract(self._pa, self._pb, out=self._pa)
+        np.subtract(self._pc, self._pb, out=self._pc)
+        np.arctan2(self._pc[:, 1], self._pc[:, 0], out=self._theta[:, 0])
+        np.arctan2(self._pa[:, 1], self._pa[:, 0], out=self._theta[:, 1])
+        np.subtract(self._theta[:, 0], self._theta[:, 1], out=self.angles)
+        np.degrees(self.angles, out=self.angles)
+        np.abs(self.angles, out=self.angles)
+        return self.angles
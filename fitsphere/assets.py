@@ -0,0 +1,156 @@
+"""Landing-page Lottie animations, served from memory.
+
+The animations are vendored under ``LOTTIE_DIR`` (populate or update them with
+``python -m fitsphere.assets``) and read once per process, so rendering the home
+page never waits on the network. Any animation that is neither vendored nor cached
+is fetched on a background thread, in parallel and with a timeout, into an on-disk
+cache under ``CACHE_DIR``; until it arrives the page renders without it, and one
+that cannot be fetched is retried at most every ``MISSING_RETRY`` seconds. With ``FITSPHERE_REFRESH_ASSETS=1``
+a background thread also re-fetches stale copies, and the cache takes precedence
+over the vendored files.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fitsphere.config import CACHE_DIR
+
+LOTTIE_DIR = "./lottie"
+LOTTIE_ASSETS = {
+    "coding": "https://assets10.lottiefiles.com/packages/lf20_FYx0Ph.json",
+    "music": "https://assets5.lottiefiles.com/packages/lf20_ikk4jhps.json",
+    "podcast": "https://assets8.lottiefiles.com/packages/lf20_JjpNLdaKYX.json",
+    "hero": "https://assets3.lottiefiles.com/packages/lf20_tutdw4n3.json",
+}
+REFRESH = os.environ.get("FITSPHERE_REFRESH_ASSETS") == "1"
+REFRESH_TTL = 24 * 3600.0
+FETCH_TIMEOUT = 5.0
+MISSING_RETRY = 300.0
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def fetch_all(urls, timeout=5.0, workers=4):
+    """Fetch ``{name: url}`` in parallel; returns ``{name: json or None}``."""
+    import requests
+
+    def fetch(url):
+        try:
+            response = requests.get(url, timeout=timeout)
+            return response.json() if response.status_code == 200 else None
+        except (requests.RequestException, ValueError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(urls, pool.map(fetch, urls.values())))
+
+
+# ---- Asset Store ----
+class LottieAssets:
+    """In-memory Lottie animations by name; ``get`` returns None for any that are unavailable."""
+
+    def __init__(self, assets=LOTTIE_ASSETS, lottie_dir=LOTTIE_DIR, cache_dir=CACHE_DIR, fetch_missing=True):
+        self.assets = dict(assets)
+        self.lottie_dir = lottie_dir
+        self.cache_dir = os.path.join(cache_dir, "lottie")
+        self.fetch_missing = fetch_missing
+        self._data = {}
+        self._lock = threading.Lock()
+        self._retry_at = 0.0
+        for name in self.assets:
+            paths = (self._cache_path(name), self._vendored_path(name))
+            for path in paths if REFRESH else reversed(paths):
+                self._data[name] = _read_json(path)
+                if self._data[name] is not None:
+                    break
+
+    def _vendored_path(self, name):
+        return os.path.join(self.lottie_dir, f"{name}.json")
+
+    def _cache_path(self, name):
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _store(self, fetched):
+        for name, data in fetched.items():
+            if data is not None:
+                _write_json(self._cache_path(name), data)
+                self._data[name] = data
+
+    def _fetch_missing(self, timeout=FETCH_TIMEOUT):
+        """Fetch every animation that is still unavailable into the disk cache."""
+        missing = {name: url for name, url in self.assets.items() if self._data.get(name) is None}
+        if missing:
+            self._store(fetch_all(missing, timeout))
+
+    def get(self, name):
+        """The animation ``name``, or None; a missing one is fetched in the background for later renders."""
+        data = self._data.get(name)
+        if data is None and self.fetch_missing and name in self.assets:
+            with self._lock:
+                if time.time() >= self._retry_at:
+                    self._retry_at = time.time() + MISSING_RETRY
+                    threading.Thread(target=self._fetch_missing, name="lottie-fetch", daemon=True).start()
+        return data
+
+    def refresh(self, timeout=FETCH_TIMEOUT, ttl=REFRESH_TTL):
+        """Re-fetch animations whose cached copy is older than ``ttl`` and swap them in."""
+        now = time.time()
+        stale = {
+            name: url for name, url in self.assets.items()
+            if not os.path.exists(self._cache_path(name)) or now - os.path.getmtime(self._cache_path(name)) > ttl
+        }
+        self._store(fetch_all(stale, timeout))
+
+
+_assets = None
+_assets_lock = threading.Lock()
+
+
+def get_lottie_assets():
+    """Process-wide ``LottieAssets``, read from disk on first use (refreshed in the background if enabled)."""
+    global _assets
+    with _assets_lock:
+        if _assets is None:
+            _assets = LottieAssets()
+            if REFRESH:
+                threading.Thread(target=_assets.refresh, name="lottie-refresh", daemon=True).start()
+        return _assets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download the landing-page Lottie animations into the repo.")
+    parser.add_argument("--out", default=LOTTIE_DIR)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    failed = []
+    for name, data in fetch_all(LOTTIE_ASSETS, args.timeout).items():
+        if data is None:
+            failed.append(name)
+        else:
+            _write_json(os.path.join(args.out, f"{name}.json"), data)
+            print(f"Saved {name} to {os.path.join(args.out, name + '.json')}")
+    if failed:
+        print(f"Could not fetch: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
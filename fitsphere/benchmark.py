@@ -0,0 +1,242 @@
+"""Headless benchmark for the trainer frame loop.
+
+Replays recorded videos (through a real pose detector) or landmark fixtures
+(``.npz`` files made with the ``record`` command) through the same angle, smoothing,
+rep-counting and render code as the live trainer, and reports per-stage latency
+percentiles, throughput and rep-count accuracy against labels. Rendering is throttled
+to ``--display-fps`` on the clip's own clock, like the live page, so the ``render``
+stage and FPS match production; ``encode`` times the overlay and JPEG encode of just
+the frames that were rendered.
+
+    python -m fitsphere.benchmark record clip.mp4 clip.npz --exercise Squats --reps 12
+    python -m fitsphere.benchmark run clip.npz other.mp4 --labels labels.json --json report.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from fitsphere.angles import NUM_LANDMARKS, landmarks_to_array
+from fitsphere.detectors import DEFAULT_CONFIDENCE, create_pose_detector
+from fitsphere.exercises import EXERCISES, get_exercises
+from fitsphere.pipeline import FRAME_SIZE
+from fitsphere.render import ThrottledRenderer, draw_overlay
+from fitsphere.session import ExerciseSession
+
+STAGES = ("capture", "inference", "angle", "render", "encode")
+DISPLAY_FPS = 12  # the trainer page's default video refresh rate
+PERCENTILES = (50, 95, 99)
+
+
+# ---- Frame Sources ----
+def _video_source(path, detector):
+    """Yield ``(img, landmarks)`` per frame, timing capture and inference separately."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video file: {path}")
+    try:
+        while True:
+            t0 = time.perf_counter()
+            ret, img = cap.read()
+            if not ret:
+                return
+            img = cv2.resize(img, FRAME_SIZE)
+            t1 = time.perf_counter()
+            detector.findPose(img, draw=False)
+            lmlist, _ = detector.findPosition(img, draw=False)
+            yield img, lmlist or None, t1 - t0, time.perf_counter() - t1
+    finally:
+        cap.release()
+
+
+def _video_fps(path):
+    cap = cv2.VideoCapture(path)
+    try:
+        return cap.get(cv2.CAP_PROP_FPS) or 30.0
+    finally:
+        cap.release()
+
+
+def _fixture_source(landmarks):
+    canvas = np.zeros((FRAME_SIZE[1], FRAME_SIZE[0], 3), dtype=np.uint8)
+    for frame in landmarks:
+        t0 = time.perf_counter()
+        pose = None if np.isnan(frame).any() else frame
+        yield canvas, pose, time.perf_counter() - t0, 0.0
+
+
+def load_fixture(path):
+    data = np.load(path, allow_pickle=False)
+    labels = {key: data[key].item() for key in ("exercise", "reps") if key in data}
+    return data["landmarks"], float(data["fps"]), labels
+
+
+# ---- Recording ----
+def record_fixture(video_path, out_path, exercise=None, reps=None,
+                   detection_con=DEFAULT_CONFIDENCE[0], track_con=DEFAULT_CONFIDENCE[1]):
+    """Run the detector over a video once and save its landmarks as a replayable fixture."""
+    detector = create_pose_detector(detection_con, track_con)
+    fps = _video_fps(video_path)
+    frames = []
+    for _, lmlist, _, _ in _video_source(video_path, detector):
+        frame = np.full((NUM_LANDMARKS, 3), np.nan)
+        if lmlist:
+            landmarks_to_array(lmlist, out=frame)
+        frames.append(frame)
+
+    labels = {}
+    if exercise is not None:
+        labels["exercise"] = exercise
+    if reps is not None:
+        labels["reps"] = float(reps)
+    np.savez_compressed(out_path, landmarks=np.array(frames, dtype=np.float32), fps=fps, **labels)
+    return len(frames)
+
+
+# ---- Benchmark ----
+def _summarize(samples):
+    ms = np.asarray(samples) * 1000.0
+    if not len(ms):
+        return None
+    summary = {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(ms, PERCENTILES))}
+    summary["mean"] = float(ms.mean())
+    return summary
+
+
+def run_benchmark(frames, exercise, fps, weight=70, render=True, jpeg_quality=70, display_fps=DISPLAY_FPS):
+    """Drive ``frames`` (from a source generator) through the trainer pipeline and time it.
+
+    ``display_fps`` caps rendering as ``ThrottledRenderer`` does live, measured on the
+    clip's timeline (frame ``i`` is at ``i / fps``); None renders every frame.
+    """
+    session = ExerciseSession(get_exercises()[exercise], weight)
+    renderer = ThrottledRenderer(max_fps=display_fps or fps, jpeg_quality=jpeg_quality)
+    timings = {stage: [] for stage in STAGES}
+
+    started = time.perf_counter()
+    count = 0
+    for i, (img, landmarks, capture_s, inference_s) in enumerate(frames):
+        timings["capture"].append(capture_s)
+        timings["inference"].append(inference_s)
+
+        t0 = time.perf_counter()
+        session.process(landmarks, i / fps)
+        t1 = time.perf_counter()
+        timings["angle"].append(t1 - t0)
+
+        if render:
+            now = i / fps
+            if display_fps is None or renderer.frame_due(now):
+                draw_overlay(img, session.count, session.exercise.unit, session.good_form)
+                renderer.encode(img, now)
+                timings["encode"].append(time.perf_counter() - t1)
+            timings["render"].append(time.perf_counter() - t1)
+        count += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "exercise": exercise,
+        "frames": count,
+        "fps": count / elapsed if elapsed else 0.0,
+        "frames_rendered": renderer.frames_shown,
+        "display_fps": display_fps,
+        "stages": {stage: _summarize(samples) for stage, samples in timings.items()},
+        "reps": session.count,
+    }
+
+
+def benchmark_file(path, exercise=None, expected=None, detector=None, render=True, display_fps=DISPLAY_FPS):
+    if path.endswith(".npz"):
+        landmarks, fps, labels = load_fixture(path)
+        source = _fixture_source(landmarks)
+    else:
+        labels = {}
+        fps = _video_fps(path)
+        detector = detector or create_pose_detector(*DEFAULT_CONFIDENCE)
+        source = _video_source(path, detector)
+
+    exercise = exercise or labels.get("exercise") or "Squats"
+    expected = expected if expected is not None else labels.get("reps")
+    report = run_benchmark(source, exercise, fps, render=render, display_fps=display_fps)
+    report["source"] = path
+    report["expected"] = expected
+    report["error"] = None if expected is None else int(report["reps"]) - int(expected)
+    return report
+
+
+def format_report(report):
+    throttle = "unthrottled" if report["display_fps"] is None else f"capped at {report['display_fps']:g} FPS"
+    lines = [
+        f"{report['source']} [{report['exercise']}]: {report['frames']} frames, {report['fps']:.1f} FPS "
+        f"({report['frames_rendered']} rendered, {throttle})"
+    ]
+    for stage, summary in report["stages"].items():
+        if summary:
+            cells = "  ".join(f"{key} {value:7.2f} ms" for key, value in summary.items())
+            lines.append(f"  {stage:<10} {cells}")
+    accuracy = "" if report["expected"] is None else f" (expected {report['expected']:g}, error {report['error']:+d})"
+    lines.append(f"  reps       {int(report['reps'])}{accuracy}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the trainer frame loop headlessly.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Save a video's landmarks as a replayable fixture")
+    record.add_argument("video")
+    record.add_argument("fixture")
+    record.add_argument("--exercise", choices=sorted(EXERCISES))
+    record.add_argument("--reps", type=float, help="Ground-truth rep count label")
+
+    run = commands.add_parser("run", help="Replay videos and/or fixtures through the pipeline")
+    run.add_argument("sources", nargs="+", help="Video files or .npz landmark fixtures")
+    run.add_argument("--exercise", choices=sorted(EXERCISES), help="Override the labelled exercise")
+    run.add_argument("--labels", help='JSON file: {"clip.mp4": {"exercise": "Squats", "reps": 10}}')
+    run.add_argument("--no-render", action="store_true", help="Skip overlay drawing and JPEG encoding")
+    run.add_argument("--display-fps", type=float, default=DISPLAY_FPS,
+                     help="Render cap, as on the trainer page (0 renders every frame)")
+    run.add_argument("--json", help="Also write the reports to this JSON file")
+    run.add_argument("--max-rep-error", type=int, help="Exit non-zero if any |error| exceeds this")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        frames = record_fixture(args.video, args.fixture, args.exercise, args.reps)
+        print(f"Recorded {frames} frames to {args.fixture}")
+        return 0
+
+    labels = {}
+    if args.labels:
+        with open(args.labels) as f:
+            labels = json.load(f)
+
+    detector = None
+    if any(not source.endswith(".npz") for source in args.sources):
+        detector = create_pose_detector(*DEFAULT_CONFIDENCE)
+
+    reports = []
+    for source in args.sources:
+        label = labels.get(source) or labels.get(os.path.basename(source)) or {}
+        report = benchmark_file(
+            source, args.exercise or label.get("exercise"), label.get("reps"), detector, not args.no_render,
+            args.display_fps or None,
+        )
+        reports.append(report)
+        print(format_report(report))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+    if args.max_rep_error is not None:
+        if any(r["error"] is not None and abs(r["error"]) > args.max_rep_error for r in reports):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
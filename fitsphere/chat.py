@@ -0,0 +1,114 @@
+"""Streaming client for OpenAI-compatible chat completion endpoints.
+
+Talks to ``{base_url}/chat/completions`` directly over a pooled ``requests.Session``
+that lives for the whole process, so reruns and sessions reuse warm keep-alive
+connections instead of paying a TLS handshake per message. Replies are streamed as
+server-sent events and yielded token by token; connection failures, timeouts, 429s
+and 5xx responses are retried with exponential backoff until the first token
+arrives. Every failure, including a stream cut off midway or a malformed event,
+surfaces as ``ChatError``. Point ``base_url`` at a local stand-in server for testing.
+"""
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+DEFAULT_MODEL = "gpt-3.5-turbo"
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class ChatError(RuntimeError):
+    pass
+
+
+# ---- Chat Client ----
+class ChatClient:
+    """Pooled, retrying, streaming chat client; safe to share between threads."""
+
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, model=DEFAULT_MODEL, connect_timeout=5.0,
+                 read_timeout=30.0, max_retries=3, backoff=0.5, pool_size=10):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)  # read timeout also bounds gaps between tokens
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.headers.update({"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * 2 ** attempt * (0.5 + random.random())
+
+    def _open(self, payload):
+        """POST the request, retrying transient failures; returns the streaming response."""
+        url = f"{self.base_url}/chat/completions"
+        for attempt in range(self.max_retries + 1):
+            response = None
+            try:
+                response = self.session.post(url, json=payload, stream=True, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = ChatError(f"Could not reach {self.base_url}: {e}")
+            except requests.RequestException as e:
+                raise ChatError(f"Chat request failed: {e}") from e
+            else:
+                if response.ok:
+                    return response
+                error = ChatError(f"Chat request failed ({response.status_code}): {response.text[:200]}")
+                response.close()
+                if response.status_code not in RETRY_STATUS:
+                    raise error
+            if attempt == self.max_retries:
+                raise error
+            time.sleep(self._delay(attempt, response))
+
+    def stream(self, messages, **params):
+        """Yield the reply to ``messages`` as it is generated, one content delta at a time."""
+        payload = {"model": self.model, "messages": messages, "stream": True, **params}
+        response = self._open(payload)
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                choices = json.loads(data).get("choices") or [{}]
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+        except requests.RequestException as e:  # dropped connection, truncated chunk, read timeout
+            raise ChatError(f"The reply was interrupted: {e}") from e
+        except (ValueError, AttributeError) as e:  # malformed event payload
+            raise ChatError(f"Malformed reply from {self.base_url}: {e}") from e
+        finally:
+            response.close()
+
+    def complete(self, messages, **params):
+        return "".join(self.stream(messages, **params))
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_chat_client(api_key, base_url=DEFAULT_BASE_URL, model=DEFAULT_MODEL, **options):
+    """Process-wide client per ``(api_key, base_url, model)``, reused across reruns and sessions."""
+    key = (api_key, base_url, model)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = ChatClient(api_key, base_url, model, **options)
+        return client
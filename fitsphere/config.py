@@ -0,0 +1,7 @@
+import os
+
+# Directory for derived, regenerable artefacts (search indexes, binary databases, caches).
+CACHE_DIR = os.environ.get("FITSPHERE_CACHE_DIR", "./.cache")
+
+# Directory for user data that must survive restarts (meal and workout logs).
+DATA_DIR = os.environ.get("FITSPHERE_DATA_DIR", "./data")
@@ -0,0 +1,104 @@
+"""Bounded chat payloads: pinned system prompt + rolling summary + recent turns.
+
+Every request carries the system prompt, a summary of everything that has scrolled
+out of the window, and as many of the latest turns as fit in ``max_tokens``. When
+the window overflows it is shrunk to ``refill`` of the budget in one go and the
+evicted turns are folded into the summary, so the summariser runs once every few
+turns rather than on every message.
+"""
+import logging
+
+from fitsphere.chat import ChatError
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "Summarise this conversation between a gym assistant and a user in under {words} words. "
+    "Keep the user's goals, constraints, injuries, chosen routine and any open questions."
+)
+
+_encoding = None
+
+
+def count_tokens(text):
+    """Token count with tiktoken when installed, else a ~4 characters per token estimate."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def message_tokens(message):
+    return 4 + count_tokens(message["content"])  # role and framing overhead
+
+
+def llm_summarizer(client, max_tokens=300):
+    """Summariser that asks ``client`` (a ``ChatClient``) to fold new turns into the summary."""
+    def summarize(summary, messages):
+        transcript = "\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+        prompt = [
+            {"role": "system", "content": SUMMARY_PROMPT.format(words=int(max_tokens * 0.75))},
+            {"role": "user", "content": f"Summary so far:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"},
+        ]
+        return client.complete(prompt, max_tokens=max_tokens).strip()
+    return summarize
+
+
+# ---- Conversation Context ----
+class ConversationContext:
+    """Per-conversation window state: the running summary and how many turns it covers."""
+
+    def __init__(self, max_tokens=3000, refill=0.6, min_turns=2):
+        self.max_tokens = max_tokens
+        self.refill = refill
+        self.min_turns = min_turns
+        self.summary = ""
+        self.folded = 1  # messages[1:folded] are covered by the summary; messages[0] is pinned
+
+    def reset(self):
+        self.summary = ""
+        self.folded = 1
+
+    def _summary_message(self):
+        return {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+
+    def _window_start(self, messages, budget):
+        """Earliest index such that messages[start:] fit in ``budget`` (keeping ``min_turns``)."""
+        start, used = len(messages), 0
+        while start > self.folded:
+            cost = message_tokens(messages[start - 1])
+            if used + cost > budget and len(messages) - start >= self.min_turns:
+                break
+            used += cost
+            start -= 1
+        return start
+
+    def payload(self, messages, summarize=None):
+        """Messages to send for this turn; folds overflowing turns into the summary first.
+
+        If ``summarize`` is None or raises ``ChatError``, old turns are dropped without
+        being summarised (the failure is logged), so the payload stays bounded either way.
+        """
+        pinned = message_tokens(messages[0])
+        summary_cost = message_tokens(self._summary_message()) if self.summary else 0
+        start = self._window_start(messages, self.max_tokens - pinned - summary_cost)
+
+        if start > self.folded:
+            # Overflow: shrink to the refill level so the next few turns fit without folding again.
+            start = max(start, self._window_start(messages, (self.max_tokens - pinned) * self.refill - summary_cost))
+            if summarize is not None:
+                try:
+                    self.summary = summarize(self.summary, messages[self.folded:start])
+                except ChatError as e:
+                    logger.warning("Could not summarise %d earlier messages: %s", start - self.folded, e)
+            self.folded = start
+
+        head = [messages[0]] + ([self._summary_message()] if self.summary else [])
+        return head + messages[self.folded:]
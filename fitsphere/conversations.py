@@ -0,0 +1,115 @@
+"""Bounded, process-wide store of chatbot conversations.
+
+Each browser session gets its own ``Conversation``, created from a copy of the base
+prompt (never the shared list itself). Conversations keep at most ``max_messages``
+messages, are evicted after ``idle_timeout`` seconds without use, and the store holds
+at most ``max_sessions`` of them (least recently used go first), so server memory
+stays bounded however many users come and go. ``stats()`` reports what is held.
+"""
+import collections
+import threading
+import time
+
+from fitsphere.context import ConversationContext
+
+
+def _size(message):
+    return len(message["content"].encode("utf-8"))
+
+
+# ---- Conversation ----
+class Conversation:
+    """One session's messages (``messages[0]`` is the pinned system prompt) and context window."""
+
+    def __init__(self, base_prompt, max_messages=200, context_tokens=3000):
+        self.base_prompt = [dict(message) for message in base_prompt]
+        self.max_messages = max_messages
+        self.context = ConversationContext(max_tokens=context_tokens)
+        self.reset()
+
+    def reset(self):
+        self.messages = [dict(message) for message in self.base_prompt]
+        self.nbytes = sum(_size(message) for message in self.messages)
+        self.context.reset()
+
+    def append(self, role, content):
+        message = {"role": role, "content": content}
+        self.messages.append(message)
+        self.nbytes += _size(message)
+
+        # Drop the oldest turns past the cap; by then they are long folded into the summary.
+        pinned = len(self.base_prompt)
+        excess = len(self.messages) - self.max_messages
+        if excess > 0:
+            dropped = self.messages[pinned:pinned + excess]
+            del self.messages[pinned:pinned + excess]
+            self.nbytes -= sum(_size(m) for m in dropped)
+            self.context.folded = max(pinned, self.context.folded - excess)
+
+    def payload(self, summarize=None):
+        return self.context.payload(self.messages, summarize)
+
+    @property
+    def memory(self):
+        return self.nbytes + len(self.context.summary.encode("utf-8"))
+
+
+# ---- Conversation Store ----
+class ConversationStore:
+    def __init__(self, max_messages=200, idle_timeout=3600.0, max_sessions=1000, context_tokens=3000):
+        self.max_messages = max_messages
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.context_tokens = context_tokens
+        self._lock = threading.Lock()
+        self._conversations = collections.OrderedDict()  # session id -> (last used, Conversation)
+        self.evicted = 0
+
+    def _evict(self, now):
+        while self._conversations:
+            session_id, (last_used, _) = next(iter(self._conversations.items()))
+            if now - last_used < self.idle_timeout and len(self._conversations) <= self.max_sessions:
+                break
+            del self._conversations[session_id]
+            self.evicted += 1
+
+    def get(self, session_id, base_prompt):
+        """The session's conversation, created from a copy of ``base_prompt`` if new or evicted."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._conversations.pop(session_id, None)
+            conversation = entry[1] if entry is not None else Conversation(
+                base_prompt, self.max_messages, self.context_tokens
+            )
+            self._conversations[session_id] = (now, conversation)
+            self._evict(now)
+            return conversation
+
+    def discard(self, session_id):
+        with self._lock:
+            self._conversations.pop(session_id, None)
+
+    def stats(self):
+        """``{"sessions", "messages", "bytes", "evicted"}`` across every held conversation."""
+        with self._lock:
+            conversations = [conversation for _, conversation in self._conversations.values()]
+            evicted = self.evicted
+        return {
+            "sessions": len(conversations),
+            "messages": sum(len(c.messages) for c in conversations),
+            "bytes": sum(c.memory for c in conversations),
+            "evicted": evicted,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_conversation_store(**options):
+    """The process-wide ``ConversationStore``; ``options`` apply on first use only."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConversationStore(**options)
+        return _store
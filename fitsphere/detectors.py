@@ -0,0 +1,118 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_POOL_SIZE = int(os.environ.get("FITSPHERE_DETECTOR_POOL_SIZE", "4"))
+DEFAULT_CONFIDENCE = (0.7, 0.7)
+
+
+class DetectorPoolExhausted(RuntimeError):
+    pass
+
+
+def create_pose_detector(detection_con, track_con):
+    from cvzone.PoseModule import PoseDetector
+    return PoseDetector(detectionCon=detection_con, trackCon=track_con)
+
+
+# ---- Detector Pool ----
+class DetectorPool:
+    """Process-wide pool of pose detectors keyed by (detectionCon, trackCon).
+
+    Building a PoseDetector loads the MediaPipe graph, so detectors are created lazily
+    up to ``max_size`` per key and then handed from session to session.
+    """
+
+    def __init__(self, max_size=DEFAULT_POOL_SIZE, factory=create_pose_detector):
+        self.max_size = max_size
+        self.factory = factory
+        self._cond = threading.Condition()
+        self._idle = {}
+        self._created = {}
+
+    def _acquire(self, key, timeout):
+        with self._cond:
+            idle = self._idle.setdefault(key, [])
+            while not idle and self._created.get(key, 0) >= self.max_size:
+                if not self._cond.wait(timeout):
+                    raise DetectorPoolExhausted(
+                        f"All {self.max_size} pose detectors are in use; try again shortly."
+                    )
+            if idle:
+                return idle.pop()
+            self._created[key] = self._created.get(key, 0) + 1
+        try:
+            return self.factory(*key)
+        except Exception:
+            with self._cond:
+                self._created[key] -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, key, detector):
+        with self._cond:
+            self._idle[key].append(detector)
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self, detection_con=DEFAULT_CONFIDENCE[0], track_con=DEFAULT_CONFIDENCE[1], timeout=10):
+        key = (detection_con, track_con)
+        detector = self._acquire(key, timeout)
+        try:
+            yield detector
+        finally:
+            self._release(key, detector)
+
+    def warm_up(self, detection_con=DEFAULT_CONFIDENCE[0], track_con=DEFAULT_CONFIDENCE[1], count=1):
+        """Pre-build ``count`` detectors and push one blank frame through each."""
+        key = (detection_con, track_con)
+        blank = np.zeros((480, 640, 3), dtype=np.uint8)
+        detectors = []
+        try:
+            for _ in range(min(count, self.max_size)):
+                detector = self._acquire(key, timeout=0)
+                detectors.append(detector)
+                detector.findPose(blank, draw=False)
+        except DetectorPoolExhausted:
+            pass
+        finally:
+            for detector in detectors:
+                self._release(key, detector)
+
+    def stats(self):
+        with self._cond:
+            return {
+                key: {"created": created, "idle": len(self._idle.get(key, []))}
+                for key, created in self._created.items()
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_warmup_thread = None
+
+
+def get_detector_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DetectorPool()
+        return _pool
+
+
+def warm_up_in_background(detection_con=DEFAULT_CONFIDENCE[0], track_con=DEFAULT_CONFIDENCE[1]):
+    """Warm the shared pool once per process on a daemon thread so start-up is not blocked."""
+    global _warmup_thread
+    pool = get_detector_pool()
+    with _pool_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=pool.warm_up,
+                args=(detection_con, track_con),
+                daemon=True,
+                name="fitsphere-detector-warmup",
+            )
+            _warmup_thread.start()
+        return _warmup_thread
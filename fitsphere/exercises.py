@@ -0,0 +1,132 @@
+import threading
+
+import numpy as np
+
+from fitsphere.angles import JOINTS, AngleEngine
+from fitsphere.reps import HoldTimer, RepCounter
+from fitsphere.smoothing import AngleSmoother
+
+# ---- Exercise Definitions ----
+# mode:       "reps" counts half reps between the up/down edges, "hold" times how long
+#             the angle stays above ``up``.
+# joints:     JOINTS names; with several joints the mean angle is tracked.
+# interior:   fold angles into [0, 180] so left/right and camera facing don't matter.
+# calories:   kcal per kg of body weight, per rep ("reps") or per minute ("hold").
+# confirm_frames, median_window, min_cutoff, beta: rep debouncing and angle smoothing,
+#             see RepCounter and AngleSmoother.
+DEFAULTS = {
+    "mode": "reps",
+    "up": 160,
+    "down": 100,
+    "hysteresis": 0,
+    "interior": False,
+    "calories": 0.1,
+    "confirm_frames": 2,
+    "median_window": 3,
+    "min_cutoff": 1.0,
+    "beta": 0.02,
+}
+
+EXERCISES = {
+    "Squats": {"joints": ["right_knee"]},
+    "Pushups": {"joints": ["left_elbow"]},
+    "Left Dumbbell": {"joints": ["left_elbow"]},
+    "Right Dumbbell": {"joints": ["right_elbow"]},
+    "Plank": {"mode": "hold", "joints": ["left_hip", "right_hip"], "interior": True, "up": 160, "calories": 0.05},
+    "Jumping Jacks": {
+        "joints": ["left_shoulder", "right_shoulder"], "interior": True, "up": 140, "down": 50, "beta": 0.05,
+    },
+}
+
+UNITS = {"reps": "Reps", "hold": "Hold (s)"}
+
+
+# ---- Compiled Exercise ----
+class CompiledExercise:
+    """An exercise definition resolved against an ``AngleEngine`` for use in the frame loop."""
+
+    def __init__(self, name, spec, engine):
+        spec = {**DEFAULTS, **spec}
+        unknown = [joint for joint in spec["joints"] if joint not in JOINTS]
+        if unknown:
+            raise ValueError(f"Exercise {name!r} uses unknown joints: {', '.join(unknown)}")
+        if spec["mode"] not in UNITS:
+            raise ValueError(f"Exercise {name!r} has unknown mode {spec['mode']!r}")
+
+        self.name = name
+        self.mode = spec["mode"]
+        self.unit = UNITS[self.mode]
+        self.up = spec["up"]
+        self.down = spec["down"]
+        self.hysteresis = spec["hysteresis"]
+        self.interior = spec["interior"]
+        self.confirm_frames = spec["confirm_frames"]
+        self.smoothing = (spec["median_window"], spec["min_cutoff"], spec["beta"])
+        self._n_joints = len(engine.names)
+        self.joint_index = np.array([engine.index(joint) for joint in spec["joints"]], dtype=np.intp)
+        self._kcal_factor = spec["calories"] / (60.0 if self.mode == "hold" else 1.0)
+
+    def angle(self, angles):
+        """Tracked angle for one frame of engine output, or None without a pose."""
+        if angles is None:
+            return None
+        selected = angles[self.joint_index]
+        if self.interior:
+            selected = np.minimum(selected, 360.0 - selected)
+        return float(selected.mean())
+
+    def new_counter(self):
+        if self.mode == "hold":
+            return HoldTimer(self.up)
+        return RepCounter(self.up, self.down, self.hysteresis, self.confirm_frames)
+
+    def new_smoother(self):
+        """Per-session filter for the full engine output vector, tuned for this exercise."""
+        window, min_cutoff, beta = self.smoothing
+        return AngleSmoother(self._n_joints, window, min_cutoff, beta)
+
+    def calories(self, count, weight):
+        return count * weight * self._kcal_factor
+
+    def good_form(self, angle):
+        return angle is not None and angle > self.up
+
+    def count_series(self, series, fps):
+        """Smooth an engine output array sampled at ``fps`` and run this exercise's counter over it."""
+        counter = self.new_counter()
+        smoother = self.new_smoother()
+        for i, row in enumerate(series):
+            now = i / fps
+            smoothed = smoother(None if np.isnan(row).any() else row, now)
+            counter.update(self.angle(smoothed), now)
+        return counter
+
+
+# ---- Registry ----
+_registry_lock = threading.Lock()
+_compiled = None
+
+
+def register_exercise(name, **spec):
+    """Add or replace an exercise definition; takes effect on the next ``get_exercises``."""
+    global _compiled
+    with _registry_lock:
+        EXERCISES[name] = spec
+        _compiled = None
+
+
+def get_exercises(engine=None):
+    """Return ``{name: CompiledExercise}``, compiled once per process.
+
+    Compiled exercises index into the joint order of a default ``AngleEngine``, so they
+    are valid for any engine built from the default ``JOINTS``. Passing ``engine``
+    compiles a fresh, uncached set for a custom joint table.
+    """
+    global _compiled
+    if engine is not None:
+        return {name: CompiledExercise(name, spec, engine) for name, spec in EXERCISES.items()}
+    with _registry_lock:
+        if _compiled is None:
+            default_engine = AngleEngine()
+            _compiled = {name: CompiledExercise(name, spec, default_engine) for name, spec in EXERCISES.items()}
+        return _compiled
@@ -0,0 +1,138 @@
+"""Columnar, memory-mapped binary form of the food catalogue.
+
+Layout (all integers little-endian)::
+
+    header   magic b"FSFOODDB", version u32, rows u32, columns u32, reserved u32
+    columns  per column: name (16 bytes, NUL padded), dtype (8 bytes, NumPy str),
+             offset u64, length u64 (elements)
+    data     each column's raw array, 64-byte aligned
+
+Strings are interned: names (already unique) and the distinct serving strings are
+stored once each as a UTF-8 blob plus a ``u4`` offsets array, and rows refer to
+servings by id. Opening a database maps the file read-only and exposes every column
+as a zero-copy NumPy view, so all Streamlit worker processes share the same pages.
+"""
+import mmap
+import os
+import re
+import struct
+
+import numpy as np
+
+MAGIC = b"FSFOODDB"
+VERSION = 1
+HEADER = struct.Struct("<8sIIII")
+COLUMN = struct.Struct("<16s8sQQ")
+ALIGN = 64
+
+# "1 artichoke (128 g)" -> 128 g; volumes in ml are stored as grams at 1 g/ml.
+_SERVING_WEIGHT = re.compile(r"\(([\d.,]+)\s*(g|ml)\)", re.IGNORECASE)
+
+
+def parse_serving_grams(serving):
+    """Return ``(grams, is_volume)`` for a free-text serving, or ``(nan, False)``."""
+    match = _SERVING_WEIGHT.search(serving)
+    if not match:
+        return float("nan"), False
+    return float(match.group(1).replace(",", "")), match.group(2).lower() == "ml"
+
+
+def _string_table(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u4")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+# ---- Writing ----
+def write_database(path, names, servings, calories, extra_columns=None):
+    """Write a food database; ``names`` must be unique. Returns ``path``.
+
+    ``extra_columns`` maps column names to per-row numeric arrays (e.g. macros).
+    """
+    serving_ids, distinct_servings = {}, []
+    for serving in servings:
+        if serving not in serving_ids:
+            serving_ids[serving] = len(distinct_servings)
+            distinct_servings.append(serving)
+
+    parsed = [parse_serving_grams(s) for s in servings]
+    name_offsets, name_blob = _string_table(names)
+    serving_offsets, serving_blob = _string_table(distinct_servings)
+    columns = {
+        "calories": np.asarray(calories, dtype="<f4"),
+        "grams": np.array([g for g, _ in parsed], dtype="<f4"),
+        "is_volume": np.array([v for _, v in parsed], dtype=np.uint8),
+        "serving_id": np.array([serving_ids[s] for s in servings], dtype="<u4"),
+        "name_offsets": name_offsets,
+        "name_blob": name_blob,
+        "serving_offsets": serving_offsets,
+        "serving_blob": serving_blob,
+    }
+    for column, values in (extra_columns or {}).items():
+        columns[column] = np.asarray(values, dtype="<f4")
+    too_long = [column for column in columns if len(column.encode("ascii")) > 16]
+    if too_long:
+        raise ValueError(f"Column names are limited to 16 bytes: {', '.join(too_long)}")
+
+    directory_end = HEADER.size + COLUMN.size * len(columns)
+    offset = -(-directory_end // ALIGN) * ALIGN
+    directory, layout = [], []
+    for column, array in columns.items():
+        directory.append(COLUMN.pack(column.encode("ascii"), array.dtype.str.encode("ascii"), offset, len(array)))
+        layout.append((offset, array))
+        offset = -(-(offset + array.nbytes) // ALIGN) * ALIGN
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(names), len(columns), 0))
+        f.write(b"".join(directory))
+        for start, array in layout:
+            f.write(b"\0" * (start - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+# ---- Reading ----
+class FoodDatabase:
+    """Read-only, memory-mapped view of a food database file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows, n_columns, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} food database")
+
+        self.columns = {}
+        for i in range(n_columns):
+            name, dtype, offset, length = COLUMN.unpack_from(self._mmap, HEADER.size + i * COLUMN.size)
+            self.columns[name.rstrip(b"\0").decode("ascii")] = np.frombuffer(
+                self._mmap, dtype=np.dtype(dtype.rstrip(b"\0").decode("ascii")), count=length, offset=offset
+            )
+        self._names = None
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def _string(self, table, i):
+        offsets, blob = self.columns[f"{table}_offsets"], self.columns[f"{table}_blob"]
+        return blob[offsets[i]:offsets[i + 1]].tobytes().decode("utf-8")
+
+    @property
+    def names(self):
+        """All food names, decoded once per process."""
+        if self._names is None:
+            offsets, blob = self.columns["name_offsets"], self.columns["name_blob"]
+            data = blob.tobytes()
+            self._names = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.rows)]
+        return self._names
+
+    def serving(self, i):
+        return self._string("serving", int(self.columns["serving_id"][i]))
@@ -0,0 +1,164 @@
+import argparse
+import hashlib
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from fitsphere.config import CACHE_DIR
+from fitsphere.fooddb import FoodDatabase, parse_serving_grams, write_database
+from fitsphere.search import get_search_index
+
+FOOD_CSV = "./food.csv"
+FOOD_CSV_ENCODING = "mac_roman"
+REQUIRED_COLUMNS = ["Food", "Serving", "Calories"]
+
+# Per-100 g macronutrients, joined onto food.csv by name. Foods without a row (mixed
+# dishes, branded items) keep NaN macros rather than a guess.
+MACROS_CSV = "food_macros.csv"
+MACRO_COLUMNS = {"protein": "Protein", "carbs": "Carbs", "fat": "Fat", "fibre": "Fibre"}
+NUTRIENTS = ("calories",) + tuple(MACRO_COLUMNS)
+
+FoodItem = namedtuple("FoodItem", ["name", "serving", "calories", "grams", "protein", "carbs", "fat", "fibre"])
+
+
+class CatalogueError(ValueError):
+    pass
+
+
+# ---- Build Step ----
+def build_database(csv_path=FOOD_CSV, out_path=None, macros_path=None):
+    """Convert the food CSV into the binary, memory-mappable database. Returns its path.
+
+    Duplicate names keep their first row, matching what the page used to pick with
+    ``df[df["Food"] == name].iloc[0]``. Macros from ``macros_path`` (default: the
+    ``food_macros.csv`` next to the CSV) are scaled to one serving and stored as
+    extra columns.
+    """
+    df = pd.read_csv(csv_path, encoding=FOOD_CSV_ENCODING)
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise CatalogueError(f"Dataset must include {', '.join(repr(c) for c in REQUIRED_COLUMNS)} columns.")
+
+    df = df.drop_duplicates(subset="Food", keep="first")
+    names, servings = df["Food"].tolist(), df["Serving"].tolist()
+    grams = np.array([parse_serving_grams(serving)[0] for serving in servings])
+    per_100g = load_macros(macros_path or macros_path_for(csv_path), names)
+    macros = {column: per_100g[:, j] * grams / 100.0 for j, column in enumerate(MACRO_COLUMNS)}
+
+    out_path = out_path or database_path(csv_path)
+    return write_database(out_path, names, servings, df["Calories"].to_numpy(), extra_columns=macros)
+
+
+def load_macros(path, names):
+    """Per-100 g macros as a ``(len(names), 4)`` array aligned to ``names``; NaN where unknown."""
+    if not os.path.exists(path):
+        return np.full((len(names), len(MACRO_COLUMNS)), np.nan)
+    df = pd.read_csv(path)
+    missing = [col for col in ["Food", *MACRO_COLUMNS.values()] if col not in df.columns]
+    if missing:
+        raise CatalogueError(f"{path} is missing columns: {', '.join(missing)}")
+
+    df = df.drop_duplicates(subset="Food", keep="first").set_index("Food")
+    return df.reindex(names)[list(MACRO_COLUMNS.values())].to_numpy(dtype=float)
+
+
+def macros_path_for(csv_path):
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), MACROS_CSV)
+
+
+def database_path(csv_path):
+    digest = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"food_{digest}.fdb")
+
+
+# ---- Food Catalogue ----
+class FoodCatalogue:
+    """Food table backed by a memory-mapped ``FoodDatabase``, with O(1) lookup by name.
+
+    Numeric columns (``calories``, ``grams``) are zero-copy views of the shared file;
+    only the name list, its index and the small ``nutrients`` matrix (per-serving
+    ``NUTRIENTS`` per food, NaN where a macro is unknown) live in process memory.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.names = db.names
+        self.calories = db["calories"]
+        self.grams = db["grams"]
+        self.nutrients = np.full((len(db), len(NUTRIENTS)), np.nan)
+        for j, column in enumerate(NUTRIENTS):
+            if column in db.columns:
+                self.nutrients[:, j] = db[column]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.options = sorted(self._index, key=str.casefold)
+        self._search_index = None
+
+    @classmethod
+    def from_csv(cls, path=FOOD_CSV):
+        return cls(FoodDatabase(build_database(path)))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def index_of(self, name):
+        return self._index[name]
+
+    def get(self, name):
+        i = self._index[name]
+        macros = self.nutrients[i, 1:].tolist()
+        return FoodItem(name, self.db.serving(i), float(self.calories[i]), float(self.grams[i]), *macros)
+
+    @property
+    def search_index(self):
+        """Ranked fuzzy search over ``options`` (see fitsphere.search)."""
+        if self._search_index is None:
+            self._search_index = get_search_index(self.options)
+        return self._search_index
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def get_catalogue(path=FOOD_CSV):
+    """Process-wide catalogue for ``path``, rebuilt only when the CSV's mtime changes.
+
+    The binary database is reused across processes and restarts while it is newer
+    than the CSV and its macros file; otherwise it is rebuilt first.
+    """
+    key = os.path.abspath(path)
+    macros = macros_path_for(key)
+    mtime = max(os.path.getmtime(key), os.path.getmtime(macros) if os.path.exists(macros) else 0.0)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        db_path = database_path(key)
+        if not os.path.exists(db_path) or os.path.getmtime(db_path) < mtime:
+            build_database(key, db_path)
+        catalogue = FoodCatalogue(FoodDatabase(db_path))
+        catalogue.search_index  # build (or load) the search index up front, not on first keystroke
+        _cache[key] = (mtime, catalogue)
+        return catalogue
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the binary food database from a CSV.")
+    parser.add_argument("csv", nargs="?", default=FOOD_CSV)
+    parser.add_argument("--out", help="Output path (default: the cache location the app reads)")
+    parser.add_argument("--macros", help=f"Per-100 g macros CSV (default: {MACROS_CSV} next to the CSV)")
+    args = parser.parse_args(argv)
+
+    path = build_database(args.csv, args.out, args.macros)
+    print(f"Wrote {len(FoodDatabase(path))} foods ({os.path.getsize(path)} bytes) to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Vectorized health metrics: BMI, Mifflin-St Jeor calorie needs and water intake.
+
+Every function takes scalars or equal-length arrays and returns NumPy arrays, so the
+Utils calculators and bulk roster imports share one implementation:
+
+    python -m fitsphere.health members.csv --out metrics.parquet
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+ACTIVITY_LEVELS = {
+    "Sedentary (little or no exercise)": 1.2,
+    "Lightly active (light exercise/sports 1-3 days/week)": 1.375,
+    "Moderately active (moderate exercise/sports 3-5 days/week)": 1.55,
+    "Very active (hard exercise/sports 6-7 days/week)": 1.725,
+    "Extra active (very hard exercise, physical job, or training)": 1.9,
+}
+# Short names accepted in rosters alongside the full labels.
+ACTIVITY_ALIASES = {
+    "sedentary": 1.2,
+    "light": 1.375,
+    "moderate": 1.55,
+    "very": 1.725,
+    "extra": 1.9,
+}
+BMI_BOUNDS = np.array([18.5, 25.0, 30.0])
+BMI_CATEGORIES = np.array(["underweight", "normal weight", "overweight", "obese"])
+WATER_LITRES_PER_KG = 0.033
+ROSTER_COLUMNS = ["weight_kg", "height_cm", "age", "gender", "activity"]
+
+
+# ---- Metrics ----
+def bmi(weight_kg, height_cm):
+    height_m = np.asarray(height_cm, dtype=float) / 100.0
+    return np.asarray(weight_kg, dtype=float) / (height_m * height_m)
+
+
+def bmi_category(value):
+    """WHO adult bands: <18.5 underweight, <25 normal weight, <30 overweight, else obese.
+
+    Missing or non-finite BMIs get None rather than a band.
+    """
+    value = np.asarray(value, dtype=float)
+    categories = BMI_CATEGORIES.astype(object)[np.searchsorted(BMI_BOUNDS, value, side="right")]
+    return np.where(np.isfinite(value), categories, None)
+
+
+def _codes(values, lookup, what):
+    """Map an array of labels through ``lookup`` by unique value, not per element."""
+    shape = np.shape(values)
+    inverse, unique = pd.factorize(np.ravel(values))
+    if (inverse < 0).any():  # factorize codes missing values as -1
+        raise ValueError(f"Missing {what} in {int((inverse < 0).sum())} row(s)")
+    mapped = []
+    for label in unique:
+        value = lookup(str(label).strip())
+        if value is None:
+            raise ValueError(f"Unknown {what}: {str(label)!r}")
+        mapped.append(value)
+    return np.asarray(mapped, dtype=float)[inverse].reshape(shape)
+
+
+def _sex_offset(gender):
+    offsets = {"m": 5.0, "f": -161.0}
+    return _codes(gender, lambda label: offsets.get(label[:1].casefold()), "gender")
+
+
+def activity_multiplier(activity):
+    """Multipliers for activity labels (full or short names) or numeric multipliers."""
+    activity = np.asarray(activity)
+    if np.issubdtype(activity.dtype, np.number):
+        return activity.astype(float)
+    return _codes(
+        activity, lambda label: ACTIVITY_LEVELS.get(label, ACTIVITY_ALIASES.get(label.casefold())), "activity level"
+    )
+
+
+def bmr(weight_kg, height_cm, age, gender):
+    """Mifflin-St Jeor basal metabolic rate in kcal/day."""
+    weight_kg, height_cm, age = (np.asarray(v, dtype=float) for v in (weight_kg, height_cm, age))
+    return 10.0 * weight_kg + 6.25 * height_cm - 5.0 * age + _sex_offset(gender)
+
+
+def daily_calories(weight_kg, height_cm, age, gender, activity):
+    return bmr(weight_kg, height_cm, age, gender) * activity_multiplier(activity)
+
+
+def water_intake(weight_kg):
+    """Recommended daily water in litres."""
+    return np.asarray(weight_kg, dtype=float) * WATER_LITRES_PER_KG
+
+
+# ---- Bulk Import ----
+def load_roster(source, name=None):
+    """Read a member roster from CSV or Parquet; must include ``ROSTER_COLUMNS``.
+
+    ``source`` is a path or file-like object (e.g. an upload); the format comes from
+    ``name``, defaulting to ``source`` itself.
+    """
+    if os.path.splitext(name or source)[1].lower() in (".parquet", ".pq"):
+        df = pd.read_parquet(source)
+    else:
+        df = pd.read_csv(source)
+    missing = [col for col in ROSTER_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Roster is missing columns: {', '.join(missing)}")
+    return df
+
+
+def compute_metrics(df):
+    """Return ``df`` with bmi, bmi_category, bmr, daily_calories and water_litres columns added."""
+    out = df.copy()
+    weight, height = out["weight_kg"].to_numpy(), out["height_cm"].to_numpy()
+    out["bmi"] = bmi(weight, height)
+    out["bmi_category"] = bmi_category(out["bmi"].to_numpy())
+    out["bmr"] = bmr(weight, height, out["age"].to_numpy(), out["gender"].to_numpy())
+    out["daily_calories"] = out["bmr"] * activity_multiplier(out["activity"].to_numpy())
+    out["water_litres"] = water_intake(weight)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute health metrics for a member roster (CSV or Parquet).")
+    parser.add_argument("roster")
+    parser.add_argument("--out", help="Output .csv or .parquet (default: print a summary)")
+    args = parser.parse_args(argv)
+
+    metrics = compute_metrics(load_roster(args.roster))
+    if args.out:
+        if os.path.splitext(args.out)[1].lower() in (".parquet", ".pq"):
+            metrics.to_parquet(args.out, index=False)
+        else:
+            metrics.to_csv(args.out, index=False)
+        print(f"Wrote {len(metrics)} members to {args.out}")
+    else:
+        print(metrics.describe(include="all").to_string())
+
+
+if __name__ == "__main__":
+    main()
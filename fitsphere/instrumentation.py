@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+# ---- Stage Tracer ----
+class Tracer:
+    """Records per-stage spans into fixed-size ring buffers.
+
+    Memory stays bounded at ``capacity`` spans per stage however long a session runs.
+    Rolling statistics are computed over whatever the rings currently hold, and the
+    retained spans can be exported as a Chrome trace (chrome://tracing, Perfetto).
+    """
+
+    enabled = True
+
+    def __init__(self, capacity=2048):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._rings = {}
+        self._origin = time.perf_counter()
+
+    def _ring(self, stage):
+        ring = self._rings.get(stage)
+        if ring is None:
+            ring = self._rings[stage] = {
+                "start": np.zeros(self.capacity),
+                "dur": np.zeros(self.capacity),
+                "tid": np.zeros(self.capacity, dtype=np.int64),
+                "count": 0,
+            }
+        return ring
+
+    def record(self, stage, start, seconds):
+        """Record one span; ``start`` is a ``time.perf_counter()`` timestamp."""
+        with self._lock:
+            ring = self._ring(stage)
+            i = ring["count"] % self.capacity
+            ring["start"][i] = start
+            ring["dur"][i] = seconds
+            ring["tid"][i] = threading.get_ident()
+            ring["count"] += 1
+
+    def stats(self, frame_stage="render", window=2.0):
+        """Rolling ``{"fps": ..., stage: {"p50": ms, "p95": ms}}`` over the retained spans.
+
+        FPS counts ``frame_stage`` spans that started in the last ``window`` seconds.
+        """
+        now = time.perf_counter()
+        result = {"fps": 0.0}
+        with self._lock:
+            for stage, ring in self._rings.items():
+                n = min(ring["count"], self.capacity)
+                if not n:
+                    continue
+                p50, p95 = np.percentile(ring["dur"][:n], (50, 95)) * 1000.0
+                result[stage] = {"p50": float(p50), "p95": float(p95)}
+                if stage == frame_stage:
+                    recent = np.count_nonzero(ring["start"][:n] >= now - window)
+                    result["fps"] = recent / min(window, now - self._origin or window)
+        return result
+
+    def chrome_trace(self):
+        """Retained spans as a Chrome trace-event JSON string."""
+        pid = os.getpid()
+        events = []
+        with self._lock:
+            for stage, ring in self._rings.items():
+                n = min(ring["count"], self.capacity)
+                for start, dur, tid in zip(ring["start"][:n], ring["dur"][:n], ring["tid"][:n]):
+                    events.append({
+                        "name": stage,
+                        "ph": "X",
+                        "ts": (start - self._origin) * 1e6,
+                        "dur": dur * 1e6,
+                        "pid": pid,
+                        "tid": int(tid),
+                    })
+        events.sort(key=lambda event: event["ts"])
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+class NullTracer:
+    """Drop-in Tracer that records nothing, for when instrumentation is off."""
+
+    enabled = False
+
+    def record(self, stage, start, seconds):
+        pass
+
+    def stats(self, frame_stage="render", window=2.0):
+        return {}
+
+    def chrome_trace(self):
+        return json.dumps({"traceEvents": []})
+
+
+NULL_TRACER = NullTracer()
+
+
+def format_overlay(stats, stages=("inference", "render")):
+    parts = [f"FPS {stats.get('fps', 0.0):.1f}"]
+    for stage in stages:
+        if stage in stats:
+            parts.append(f"{stage} p50 {stats[stage]['p50']:.0f} / p95 {stats[stage]['p95']:.0f} ms")
+    return " | ".join(parts)
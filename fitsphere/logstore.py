@@ -0,0 +1,240 @@
+"""Shared, append-only store for meal and workout logs.
+
+One SQLite database (WAL mode, so readers never block the writer) replaces the
+per-click ``meal_plan_<timestamp>.csv`` files and the ``workout_history.csv`` rewrite.
+Every Streamlit session and process appends to the same file; rows are only ever
+inserted, each batch in a single transaction, and ``(user_id, day)`` indexes keep
+per-user reads cheap as the log grows. Downloads are exported to memory on request.
+
+Workouts also maintain rollups -- per user and exercise: sessions, reps, calories and
+duration by day, by ISO week and all-time -- upserted in the same transaction as the
+raw row, so history views read a handful of precomputed rows however many sessions
+a user has logged.
+"""
+import datetime
+import io
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from fitsphere.config import DATA_DIR
+
+DB_PATH = os.path.join(DATA_DIR, "fitsphere.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meals (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    logged_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    food TEXT NOT NULL,
+    servings REAL NOT NULL,
+    calories REAL NOT NULL,
+    protein REAL,
+    carbs REAL,
+    fat REAL,
+    fibre REAL
+);
+CREATE INDEX IF NOT EXISTS meals_user_day ON meals (user_id, day);
+
+CREATE TABLE IF NOT EXISTS workouts (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    logged_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    reps INTEGER NOT NULL,
+    calories REAL NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS workouts_user_day ON workouts (user_id, day);
+
+CREATE TABLE IF NOT EXISTS workout_rollups (
+    user_id TEXT NOT NULL,
+    grain TEXT NOT NULL,
+    period TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    sessions INTEGER NOT NULL,
+    reps INTEGER NOT NULL,
+    calories REAL NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (user_id, grain, period, exercise)
+) WITHOUT ROWID;
+"""
+
+# Rollup grains: "day" periods are ISO dates, "week" periods the ISO date of that week's
+# Monday, and "all" has the single period "all".
+GRAINS = ("day", "week", "all")
+
+UPSERT_ROLLUP = """
+INSERT INTO workout_rollups (user_id, grain, period, exercise, sessions, reps, calories, duration)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (user_id, grain, period, exercise) DO UPDATE SET
+    sessions = sessions + excluded.sessions,
+    reps = reps + excluded.reps,
+    calories = calories + excluded.calories,
+    duration = duration + excluded.duration
+"""
+
+BACKFILL_ROLLUPS = """
+INSERT INTO workout_rollups (user_id, grain, period, exercise, sessions, reps, calories, duration)
+SELECT user_id, ?, {period}, exercise, COUNT(*), SUM(reps), SUM(calories), SUM(duration)
+FROM workouts GROUP BY user_id, {period}, exercise
+ON CONFLICT (user_id, grain, period, exercise) DO NOTHING
+"""
+BACKFILL_PERIODS = {
+    "day": "day",
+    "week": "date(day, '-' || ((CAST(strftime('%w', day) AS INTEGER) + 6) % 7) || ' days')",
+    "all": "'all'",
+}
+
+MEAL_COLUMNS = ("food", "servings", "calories", "protein", "carbs", "fat", "fibre")
+WORKOUT_COLUMNS = ("exercise", "reps", "calories", "duration")
+TABLES = {"meals": MEAL_COLUMNS, "workouts": WORKOUT_COLUMNS}
+
+
+def _day(timestamp):
+    return datetime.date.fromtimestamp(timestamp).isoformat()
+
+
+def _periods(timestamp):
+    date = datetime.date.fromtimestamp(timestamp)
+    monday = date - datetime.timedelta(days=date.weekday())
+    return {"day": date.isoformat(), "week": monday.isoformat(), "all": "all"}
+
+
+def _nullable(value):
+    """SQLite has no NaN; store unknown macros as NULL."""
+    return None if value is None or value != value else value
+
+
+# ---- Log Store ----
+class LogStore:
+    """Append-only meal/workout log backed by one SQLite file.
+
+    Connections are per thread (Streamlit runs each session's script on its own
+    thread), all sharing the file through SQLite's WAL locking.
+    """
+
+    def __init__(self, path=DB_PATH, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._backfill_rollups(self._connect())
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _backfill_rollups(self, conn):
+        """Build rollups for workouts logged before the rollup table existed (runs once).
+
+        The check and the backfill share one write transaction, so processes opening the
+        store at the same time backfill once between them.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            has_rollups = conn.execute("SELECT 1 FROM workout_rollups LIMIT 1").fetchone()
+            has_workouts = conn.execute("SELECT 1 FROM workouts LIMIT 1").fetchone()
+            if has_workouts and not has_rollups:
+                for grain in GRAINS:
+                    conn.execute(BACKFILL_ROLLUPS.format(period=BACKFILL_PERIODS[grain]), (grain,))
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    # ---- Writing ----
+    def _append(self, table, user_id, rows, logged_at):
+        columns = TABLES[table]
+        logged_at = time.time() if logged_at is None else logged_at
+        values = [
+            (user_id, logged_at, _day(logged_at), *(_nullable(row.get(column)) for column in columns))
+            for row in rows
+        ]
+        if not values:
+            return 0
+        placeholders = ", ".join("?" * (len(columns) + 3))
+        with self._connect() as conn:  # one transaction per batch, rollups included
+            conn.executemany(
+                f"INSERT INTO {table} (user_id, logged_at, day, {', '.join(columns)}) VALUES ({placeholders})",
+                values,
+            )
+            if table == "workouts":
+                periods = _periods(logged_at)
+                conn.executemany(UPSERT_ROLLUP, [
+                    (user_id, grain, periods[grain], row["exercise"], 1, row["reps"], row["calories"], row["duration"])
+                    for row in rows for grain in GRAINS
+                ])
+        return len(values)
+
+    def append_meals(self, user_id, items, logged_at=None):
+        """Log one meal: ``items`` are dicts keyed by ``MEAL_COLUMNS``. Returns rows written."""
+        return self._append("meals", user_id, items, logged_at)
+
+    def append_workout(self, user_id, exercise, reps, calories, duration, logged_at=None):
+        row = {"exercise": exercise, "reps": int(reps), "calories": float(calories), "duration": float(duration)}
+        return self._append("workouts", user_id, [row], logged_at)
+
+    # ---- Reading ----
+    def read(self, table, user_id, since=None, limit=None):
+        """Rows for ``user_id`` (newest first) as a DataFrame; ``since`` is an ISO day."""
+        query = f"SELECT logged_at, day, {', '.join(TABLES[table])} FROM {table} WHERE user_id = ?"
+        params = [user_id]
+        if since is not None:
+            query += " AND day >= ?"
+            params.append(since)
+        query += " ORDER BY day DESC, logged_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        df = pd.read_sql_query(query, self._connect(), params=params)
+        # Local time, like ``_day`` and the rollup periods, so rows and totals agree near midnight.
+        df["logged_at"] = pd.to_datetime(df["logged_at"].map(datetime.datetime.fromtimestamp))
+        return df
+
+    def rollups(self, user_id, grain, since=None):
+        """Per-exercise workout aggregates for ``grain`` ("day", "week" or "all"), newest period first.
+
+        Reads only precomputed rows: at most one per period and exercise.
+        """
+        query = (
+            "SELECT period, exercise, sessions, reps, calories, duration FROM workout_rollups "
+            "WHERE user_id = ? AND grain = ?"
+        )
+        params = [user_id, grain]
+        if since is not None:
+            query += " AND period >= ?"
+            params.append(since)
+        query += " ORDER BY period DESC, exercise"
+        return pd.read_sql_query(query, self._connect(), params=params)
+
+    def export_csv(self, table, user_id):
+        """Full history for ``user_id`` as CSV bytes, built in memory."""
+        buffer = io.StringIO()
+        self.read(table, user_id).to_csv(buffer, index=False)
+        return buffer.getvalue().encode("utf-8")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_log_store():
+    """The process-wide ``LogStore`` at ``DB_PATH``."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LogStore()
+        return _store
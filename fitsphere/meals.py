@@ -0,0 +1,48 @@
+"""Vectorized nutrient totals for meals, days and whole weekly plans.
+
+Meals are described by two parallel arrays -- catalogue indices and servings -- so a
+total is one gather from ``FoodCatalogue.nutrients`` and one weighted sum, whatever
+the number of dishes. Plans add leading axes (days, meals) and pad unused slots with
+index ``-1``.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from fitsphere.foods import NUTRIENTS
+
+MealTotals = namedtuple("MealTotals", ["totals", "per_item", "missing"])
+
+
+def _gather(catalogue, indices, servings):
+    indices = np.asarray(indices, dtype=np.intp)
+    servings = np.asarray(servings, dtype=float)
+    if indices.shape != servings.shape:
+        raise ValueError(f"indices {indices.shape} and servings {servings.shape} must have the same shape")
+    empty = indices < 0
+    per_item = catalogue.nutrients[np.where(empty, 0, indices)] * servings[..., None]
+    per_item[empty] = 0.0
+    return per_item
+
+
+def meal_totals(catalogue, indices, servings):
+    """Totals for one meal as ``MealTotals``.
+
+    ``totals`` and each row of ``per_item`` are ordered like ``NUTRIENTS``. Unknown
+    macros count as zero in ``totals``; ``missing`` flags the items that lacked them.
+    """
+    per_item = _gather(catalogue, indices, servings)
+    missing = np.isnan(per_item).any(axis=1)
+    return MealTotals(np.nansum(per_item, axis=0), per_item, missing)
+
+
+def plan_totals(catalogue, indices, servings):
+    """Sum the last (item) axis of a padded plan, e.g. ``(days, meals, items)`` -> ``(days, meals, 5)``.
+
+    Reduce further with ``.sum(axis=...)`` for daily or weekly totals.
+    """
+    return np.nansum(_gather(catalogue, indices, servings), axis=-2)
+
+
+def as_dict(totals):
+    return {name: float(value) for name, value in zip(NUTRIENTS, totals)}
@@ -0,0 +1,193 @@
+"""Size-optimised variants of the tutorial media, built off the render path.
+
+GIF demonstrations are transcoded to downscaled, looping animated WebP, and card
+images get WebP thumbnails, each at a few fixed widths. Variants are written under
+``MEDIA_DIR`` named by the source's content hash, so they are rebuilt only when a
+source changes and are shared by every process. ``python -m fitsphere.media``
+prebuilds them at deploy time; otherwise the first request for a variant queues it on
+a background worker and the page shows the original until it is ready -- no session
+ever waits on a transcode. ``MEDIA_DIR`` sits under Streamlit's static folder, so the
+variants are served as plain files and offered to the browser through ``srcset``
+(needs ``server.enableStaticServing``, set in ``.streamlit/config.toml``).
+"""
+import argparse
+import glob
+import hashlib
+import html
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageSequence
+
+STATIC_DIR = "./static"  # served by Streamlit at STATIC_URL
+STATIC_URL = "app/static"
+MEDIA_DIR = os.path.join(STATIC_DIR, "media")
+ANIMATION_WIDTHS = (320, 480)
+ANIMATION_QUALITY = 60
+THUMBNAIL_WIDTHS = (320, 640)
+THUMBNAIL_QUALITY = 75
+
+
+def content_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _scaled(size, max_width):
+    width, height = size
+    if width <= max_width:
+        return size
+    return max_width, max(1, round(height * max_width / width))
+
+
+def _save_atomic(image, dst, **params):
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    image.save(tmp, format="WEBP", **params)
+    os.replace(tmp, dst)
+
+
+# ---- Transcoding ----
+def transcode_animation(src, dst, max_width=ANIMATION_WIDTHS[-1], quality=ANIMATION_QUALITY):
+    """Write ``src`` (an animated GIF) to ``dst`` as a looping animated WebP no wider than ``max_width``."""
+    with Image.open(src) as gif:
+        size = _scaled(gif.size, max_width)
+        frames, durations = [], []
+        for frame in ImageSequence.Iterator(gif):
+            frames.append(frame.convert("RGBA").resize(size, Image.LANCZOS))
+            durations.append(frame.info.get("duration", gif.info.get("duration", 100)) or 100)
+    _save_atomic(
+        frames[0], dst, save_all=True, append_images=frames[1:], duration=durations, loop=0,
+        quality=quality, method=4,  # method 6 is ~10x slower for a few percent smaller output
+    )
+    return dst
+
+
+def make_thumbnail(src, dst, width, quality=THUMBNAIL_QUALITY):
+    """Write a WebP copy of ``src`` no wider than ``width`` to ``dst``."""
+    with Image.open(src) as image:
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        _save_atomic(image.resize(_scaled(image.size, width), Image.LANCZOS), dst, quality=quality, method=4)
+    return dst
+
+
+# ---- Media Library ----
+class MediaLibrary:
+    """Maps source files to their built variants; each variant is built at most once per process.
+
+    Builds run on a small worker pool, outside the library lock, so other sessions'
+    lookups never wait on a transcode.
+    """
+
+    def __init__(self, media_dir=MEDIA_DIR, workers=2):
+        self.media_dir = media_dir
+        self._lock = threading.Lock()
+        self._hashes = {}  # (path, mtime_ns, size) -> content hash
+        self._built = {}  # (hash, variant) -> path
+        self._pending = {}  # (hash, variant) -> Future
+        self._failed = set()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-build")
+
+    def _hash(self, path):
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        digest = self._hashes.get(key)
+        if digest is None:
+            digest = self._hashes[key] = content_hash(path)
+        return digest
+
+    def _build(self, key, build, src, dst):
+        try:
+            build(src, dst)
+        except (OSError, ValueError):
+            dst = None
+        with self._lock:
+            self._pending.pop(key, None)
+            if dst is None:
+                self._failed.add(key)
+            else:
+                self._built[key] = dst
+        return dst
+
+    def _variant(self, path, variant, build, wait):
+        key = (self._hash(path), variant)
+        with self._lock:
+            built = self._built.get(key)
+            if built is not None or key in self._failed:
+                return built
+            stem = os.path.splitext(os.path.basename(path))[0]
+            dst = os.path.join(self.media_dir, f"{stem}_{key[0]}_{variant}.webp")
+            if os.path.exists(dst):
+                self._built[key] = dst
+                return dst
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._pool.submit(self._build, key, build, path, dst)
+        return future.result() if wait else None
+
+    def animation(self, path, max_width=ANIMATION_WIDTHS[-1], wait=False):
+        """Path of the animated WebP for GIF ``path``, or None while it is still being built."""
+        return self._variant(
+            path, f"anim{max_width}", lambda src, dst: transcode_animation(src, dst, max_width), wait
+        )
+
+    def thumbnail(self, path, width=THUMBNAIL_WIDTHS[-1], wait=False):
+        """Path of the ``width``-pixel WebP thumbnail for image ``path``, or None while it is still being built."""
+        return self._variant(path, f"w{width}", lambda src, dst: make_thumbnail(src, dst, width), wait)
+
+    def url(self, built):
+        """URL Streamlit serves ``built`` at, or None if it is outside ``STATIC_DIR``."""
+        relative = os.path.relpath(os.path.abspath(built), os.path.abspath(STATIC_DIR))
+        return None if relative.startswith("..") else f"{STATIC_URL}/{relative.replace(os.sep, '/')}"
+
+    def image_html(self, path, animated=False, alt="", sizes="100vw"):
+        """``<img>`` offering every width of ``path`` through ``srcset``, or None until all are built."""
+        widths = ANIMATION_WIDTHS if animated else THUMBNAIL_WIDTHS
+        variant = self.animation if animated else self.thumbnail
+        urls = [self.url(built) if built else None for built in (variant(path, width) for width in widths)]
+        if None in urls:
+            return None
+        srcset = ", ".join(f"{url} {width}w" for url, width in zip(urls, widths))
+        return (
+            f'<img src="{urls[-1]}" srcset="{srcset}" sizes="{html.escape(sizes)}" alt="{html.escape(alt)}" '
+            'style="width:100%;height:auto;" loading="lazy">'
+        )
+
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def get_media_library():
+    global _library
+    with _library_lock:
+        if _library is None:
+            _library = MediaLibrary()
+        return _library
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prebuild the optimised tutorial media variants.")
+    parser.add_argument("--gifs", default="./gif/*.gif")
+    parser.add_argument("--images", default="./images/*")
+    args = parser.parse_args(argv)
+
+    library = get_media_library()
+    pairs = []
+    for src in sorted(glob.glob(args.gifs)):
+        pairs.extend((src, library.animation(src, width, wait=True)) for width in ANIMATION_WIDTHS)
+    for src in sorted(glob.glob(args.images)):
+        pairs.extend((src, library.thumbnail(src, width, wait=True)) for width in THUMBNAIL_WIDTHS)
+    for src, built in pairs:
+        if built is None:
+            print(f"{src}: could not build")
+        else:
+            print(f"{src} ({os.path.getsize(src) // 1024} KiB) -> {built} ({os.path.getsize(built) // 1024} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from fitsphere.angles import AngleEngine
+from fitsphere.detectors import DEFAULT_CONFIDENCE, create_pose_detector
+from fitsphere.exercises import EXERCISES, get_exercises
+from fitsphere.pipeline import FRAME_SIZE
+
+MIN_CHUNK_FRAMES = 120
+
+VideoAnalysis = namedtuple("VideoAnalysis", ["path", "angles", "reps", "fps", "duration"])
+
+# Per-worker-process state, created once by the pool initializer.
+_worker_detector = None
+_worker_engine = None
+
+
+def _init_worker(detection_con, track_con):
+    global _worker_detector, _worker_engine
+    _worker_detector = create_pose_detector(detection_con, track_con)
+    _worker_engine = AngleEngine()
+
+
+def _process_chunk(path, start, stop):
+    """Return the ``(frames, n_joints)`` angle series for frames ``start:stop`` of ``path``.
+
+    ``stop=None`` decodes to the end of the file. Fewer rows come back if the file
+    ends early.
+    """
+    missing = np.full(len(_worker_engine.names), np.nan)
+    rows = []
+    cap = cv2.VideoCapture(path)
+    try:
+        if start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        while stop is None or len(rows) < stop - start:
+            ret, img = cap.read()
+            if not ret:
+                break
+            img = cv2.resize(img, FRAME_SIZE)
+            _worker_detector.findPose(img, draw=False)
+            lmlist, _ = _worker_detector.findPosition(img, draw=False)
+            frame_angles = _worker_engine.compute(lmlist)
+            rows.append(missing if frame_angles is None else frame_angles)
+    finally:
+        cap.release()
+    return start, np.array(rows, dtype=float).reshape(len(rows), len(missing))
+
+
+# ---- Video Probing ----
+def probe_video(path):
+    """Return ``(frame_count, fps)`` for a video file; ``frame_count`` is 0 if the container doesn't report it."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video file: {path}")
+    try:
+        frames = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)  # some containers report -1 or 0
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    finally:
+        cap.release()
+    return frames, fps
+
+
+def split_frames(frame_count, workers, min_chunk=MIN_CHUNK_FRAMES):
+    """Split ``range(frame_count)`` into contiguous chunks, about two per worker."""
+    chunk = max(min_chunk, -(-frame_count // (workers * 2)))
+    return [(start, min(start + chunk, frame_count)) for start in range(0, frame_count, chunk)]
+
+
+def _make_executor(workers, detection_con, track_con):
+    # "spawn" keeps MediaPipe out of forked copies of a multi-threaded Streamlit server.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(detection_con, track_con),
+    )
+
+
+def _submit(executor, workers, path):
+    frame_count, fps = probe_video(path)
+    # Without a frame count the clip can't be split, so it is decoded in one pass.
+    chunks = split_frames(frame_count, workers) if frame_count else [(0, None)]
+    futures = [executor.submit(_process_chunk, path, start, stop) for start, stop in chunks]
+    return path, frame_count, fps, futures
+
+
+def _collect(job, exercise):
+    path, frame_count, fps, futures = job
+    chunks = [future.result() for future in futures]
+    if not any(len(angles) for _, angles in chunks):
+        raise ValueError(f"Could not decode any frames from video file: {path}")
+    if not frame_count:
+        frame_count = len(chunks[0][1])
+    engine = AngleEngine()
+    series = np.full((frame_count, len(engine.names)), np.nan)
+    for start, angles in chunks:
+        series[start:start + len(angles)] = angles
+
+    counter = exercise.count_series(series, fps)
+    return VideoAnalysis(path, series, counter.counter, fps, frame_count / fps)
+
+
+# ---- Offline Analysis ----
+def analyze_videos(paths, exercise, workers=None, detection_con=DEFAULT_CONFIDENCE[0],
+                   track_con=DEFAULT_CONFIDENCE[1]):
+    """Count reps in recorded workouts, running pose detection across worker processes.
+
+    Every clip is split into frame-range chunks and all chunks are queued up front,
+    so one warm worker pool stays busy across the whole batch. ``exercise`` is a name
+    from the exercise registry; ``reps`` is its counter value (seconds for holds).
+    Each result's ``angles`` array holds every tracked joint for every frame (NaN
+    where no pose was found), in the column order of ``AngleEngine.names``.
+    """
+    rule = get_exercises()[exercise]
+    workers = workers or os.cpu_count() or 1
+    with _make_executor(workers, detection_con, track_con) as executor:
+        jobs = [_submit(executor, workers, path) for path in paths]
+        return [_collect(job, rule) for job in jobs]
+
+
+def analyze_video(path, exercise, **kwargs):
+    return analyze_videos([path], exercise, **kwargs)[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count reps in recorded workout videos.")
+    parser.add_argument("videos", nargs="+", help="Video files to analyse")
+    parser.add_argument("--exercise", default="Squats", choices=sorted(EXERCISES))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    unit = get_exercises()[args.exercise].unit
+    for result in analyze_videos(args.videos, args.exercise, workers=args.workers):
+        print(f"{result.path}: {unit} {int(result.reps)} in {result.duration:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+import cv2
+
+from fitsphere.instrumentation import NULL_TRACER
+
+# A frame that has been through pose inference, ready for the render stage.
+# ``skipped`` frames were not run through the detector and carry no landmarks.
+FrameResult = namedtuple("FrameResult", ["img", "lmlist", "captured_at", "skipped"])
+
+FRAME_SIZE = (640, 480)
+
+
+# ---- Drop-Oldest Queue ----
+class LatestQueue:
+    """Bounded queue that discards the oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize=1):
+        self._items = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def offer(self, item):
+        """Enqueue ``item`` only if there is room, so it never displaces a queued item."""
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                return False
+            self._items.append(item)
+            self._cond.notify()
+            return True
+
+    def get(self, timeout=None):
+        """Return the oldest queued item, or None on timeout / once closed and drained."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+# ---- Per-Stage Timing ----
+class StageTimings:
+    """Thread-safe exponential moving average of per-stage latency in milliseconds.
+
+    Every sample is also forwarded to ``tracer`` (see fitsphere.instrumentation).
+    """
+
+    def __init__(self, alpha=0.1, tracer=NULL_TRACER):
+        self.alpha = alpha
+        self.tracer = tracer
+        self._lock = threading.Lock()
+        self._ms = {}
+        self._counts = {}
+        self._started = time.perf_counter()
+
+    def record(self, stage, seconds, start=None):
+        if self.tracer.enabled:
+            self.tracer.record(stage, time.perf_counter() - seconds if start is None else start, seconds)
+        ms = seconds * 1000.0
+        with self._lock:
+            prev = self._ms.get(stage)
+            self._ms[stage] = ms if prev is None else prev + self.alpha * (ms - prev)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def snapshot(self):
+        """Return {stage: {"ms": avg_ms, "fps": throughput}} for every stage seen so far."""
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        with self._lock:
+            return {
+                stage: {"ms": ms, "fps": self._counts[stage] / elapsed}
+                for stage, ms in self._ms.items()
+            }
+
+
+# ---- Pipeline Stages ----
+class CaptureThread(threading.Thread):
+    """Reads frames as fast as the camera delivers them, keeping only the newest.
+
+    The thread owns the capture device once started and releases it on exit, so the
+    device is never released while a ``read`` is still in flight.
+    """
+
+    def __init__(self, cap, out_queue, timings, stop_event):
+        super().__init__(daemon=True, name="fitsphere-capture")
+        self.cap = cap
+        self.out_queue = out_queue
+        self.timings = timings
+        self.stop_event = stop_event
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set() and self.cap.isOpened():
+                t0 = time.perf_counter()
+                ret, img = self.cap.read()
+                if not ret:
+                    break
+                self.timings.record("capture", time.perf_counter() - t0, t0)
+                self.out_queue.put((img, t0))
+        finally:
+            self.out_queue.close()
+            self.cap.release()
+
+
+class InferenceThread(threading.Thread):
+    """Runs pose detection on the newest captured frame and publishes the landmarks.
+
+    With an ``AdaptiveController`` attached, frames may be skipped or run through the
+    detector at reduced resolution; landmarks are always reported in FRAME_SIZE pixels.
+    """
+
+    def __init__(self, detector, in_queue, out_queue, timings, stop_event, controller=None):
+        super().__init__(daemon=True, name="fitsphere-inference")
+        self.detector = detector
+        self.in_queue = in_queue
+        self.out_queue = out_queue
+        self.timings = timings
+        self.stop_event = stop_event
+        self.controller = controller
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set():
+                item = self.in_queue.get(timeout=0.5)
+                if item is None:
+                    if self.in_queue.closed:
+                        break
+                    continue
+                img, captured_at = item
+                img = cv2.resize(img, FRAME_SIZE)
+                if self.controller is not None and not self.controller.should_infer():
+                    # Skipped frames must never evict a pending inference result.
+                    self.out_queue.offer(FrameResult(img, None, captured_at, True))
+                    continue
+
+                t0 = time.perf_counter()
+                lmlist = self._detect(img)
+                elapsed = time.perf_counter() - t0
+                self.timings.record("inference", elapsed, t0)
+                if self.controller is not None:
+                    self.controller.record(elapsed)
+                self.out_queue.put(FrameResult(img, lmlist, captured_at, False))
+        finally:
+            self.out_queue.close()
+
+    def _detect(self, img):
+        scale = self.controller.scale if self.controller is not None else 1.0
+        if scale == 1.0:
+            self.detector.findPose(img, draw=False)
+            lmlist, _ = self.detector.findPosition(img, draw=False)
+            return lmlist
+
+        small = cv2.resize(img, (int(FRAME_SIZE[0] * scale), int(FRAME_SIZE[1] * scale)))
+        self.detector.findPose(small, draw=False)
+        lmlist, _ = self.detector.findPosition(small, draw=False)
+        return [[lm[0]] + [v / scale for v in lm[1:]] for lm in lmlist]
+
+
+# ---- Frame Pipeline ----
+class FramePipeline:
+    """Producer/consumer pipeline: capture thread -> inference thread -> caller's render loop.
+
+    Rendering stays on the calling (Streamlit script) thread, since Streamlit elements
+    can only be updated from there. Use as a context manager so the worker threads and
+    the capture device are released even when Streamlit interrupts the script.
+    """
+
+    def __init__(self, cap, detector, queue_size=1, controller=None, tracer=NULL_TRACER):
+        self.cap = cap
+        self.controller = controller
+        self.tracer = tracer
+        self.timings = StageTimings(tracer=tracer)
+        self._stop = threading.Event()
+        self._frames = LatestQueue(queue_size)
+        self._results = LatestQueue(queue_size)
+        self._capture = CaptureThread(cap, self._frames, self.timings, self._stop)
+        self._inference = InferenceThread(
+            detector, self._frames, self._results, self.timings, self._stop, controller
+        )
+
+    def start(self):
+        self._capture.start()
+        self._inference.start()
+        return self
+
+    def results(self):
+        """Yield inference results until the source is exhausted or the pipeline is stopped."""
+        while not self._stop.is_set():
+            result = self._results.get(timeout=0.5)
+            if result is None:
+                if self._results.closed:
+                    return
+                continue
+            yield result
+
+    def record_render(self, seconds, captured_at):
+        now = time.perf_counter()
+        self.timings.record("render", seconds, now - seconds)
+        self.timings.record("latency", now - captured_at, captured_at)
+
+    @property
+    def dropped_frames(self):
+        return self._frames.dropped + self._results.dropped
+
+    def stop(self):
+        self._stop.set()
+        self._frames.close()
+        self._results.close()
+        if self._capture.ident is None:
+            self.cap.release()  # never started, so no thread owns the device
+        elif self._capture.is_alive():
+            # A read blocked on the camera may outlast the timeout; the thread then
+            # releases the device itself once the read returns.
+            self._capture.join(timeout=2)
+        if self._inference.is_alive():
+            # Wait it out: the detector goes back to the shared pool after this
+            # returns, and each step is bounded (queue timeout plus one inference).
+            self._inference.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
@@ -0,0 +1,188 @@
+"""Daily meal planning against calorie and macro targets, plus lower-calorie swaps.
+
+The planner solves a small integer program -- whole servings per food, at most
+``max_items`` distinct foods, at most ``max_servings`` of each, excluded foods never
+chosen. Its continuous relaxation (bounded weighted least squares, solved by projected
+gradient) picks a starting plan, which is rounded and then improved by local search
+over integer moves. Every move of a step (add one serving of any food, remove one, or
+replace a chosen food outright) is scored at once with NumPy, so a plan over the full
+catalogue takes milliseconds.
+"""
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from fitsphere.foods import NUTRIENTS
+
+PlanTargets = namedtuple("PlanTargets", NUTRIENTS)
+MealPlan = namedtuple("MealPlan", ["indices", "servings", "totals", "score"])
+Swap = namedtuple("Swap", ["index", "calories", "saving"])
+
+# Relative weight of each nutrient's squared relative error; calories dominate.
+WEIGHTS = np.array([4.0, 1.0, 1.0, 1.0, 0.5])
+# A zero target (e.g. a 0% carb split) has no relative error; its absolute error is
+# measured instead, in units of the grams that would supply this share of the calories.
+ZERO_TARGET_SHARE = 0.1
+KCAL_PER_UNIT = np.array([1.0, 4.0, 4.0, 9.0, 2.0])
+MAX_STEPS = 500
+RELAXATION_STEPS = 2000
+
+
+def macro_targets(calories, protein_pct=30, carbs_pct=40, fat_pct=30, fibre=30):
+    """Gram targets for a calorie goal split by percentage of energy (4/4/9 kcal per g)."""
+    total = float(protein_pct + carbs_pct + fat_pct) or 1.0
+    return PlanTargets(
+        float(calories),
+        calories * protein_pct / total / 4.0,
+        calories * carbs_pct / total / 4.0,
+        calories * fat_pct / total / 9.0,
+        float(fibre),
+    )
+
+
+# ---- Planner ----
+class MealPlanner:
+    """Integer servings plan for one day from the foods with complete nutrient data."""
+
+    def __init__(self, catalogue, weights=WEIGHTS):
+        self.catalogue = catalogue
+        self.weights = np.asarray(weights, dtype=float)
+        nutrients = catalogue.nutrients
+        self._eligible = ~np.isnan(nutrients).any(axis=1) & (nutrients[:, 0] > 0)
+
+    def _score(self, totals, targets, scale):
+        error = (totals - targets) / scale
+        error[..., 4] = np.minimum(error[..., 4], 0.0)  # fibre is a floor, not a target
+        return (self.weights * error ** 2).sum(axis=-1)
+
+    def _relaxed(self, foods, targets, scale, max_servings):
+        """Fractional servings minimising the weighted relative error, each in [0, max_servings]."""
+        a = foods / scale * np.sqrt(self.weights)  # (foods, nutrients)
+        b = targets / scale * np.sqrt(self.weights)
+        step = 1.0 / max(np.linalg.norm(a, 2) ** 2, 1e-12)
+        x = np.zeros(len(foods))
+        for _ in range(RELAXATION_STEPS):
+            x = np.clip(x - step * (a @ (x @ a - b)), 0.0, max_servings)
+        return x
+
+    def _start(self, foods, targets, scale, max_items, max_servings):
+        x = self._relaxed(foods, targets, scale, max_servings)
+        servings = np.zeros(len(foods), dtype=np.int64)
+        keep = np.argsort(-x * foods[:, 0])[:max_items]
+        servings[keep] = np.rint(x[keep]).astype(np.int64)
+        return servings
+
+    def plan(self, targets, max_items=6, max_servings=3, exclude=()):
+        """Return a ``MealPlan`` whose totals approach ``targets`` (a ``PlanTargets``).
+
+        Local search runs from both the rounded relaxation and an empty plan; the
+        better result wins. Raises ``ValueError`` if the exclusions leave no foods.
+        """
+        targets = np.maximum(np.asarray(targets, dtype=float), 0.0)
+        zero_scale = max(targets[0], 1.0) * ZERO_TARGET_SHARE / KCAL_PER_UNIT
+        scale = np.where(targets > 0, targets, zero_scale)
+        eligible = self._eligible.copy()
+        eligible[[self.catalogue.index_of(name) for name in exclude if name in self.catalogue]] = False
+        ids = np.flatnonzero(eligible)
+        if not len(ids):
+            raise ValueError("No foods with complete nutrient data are left to plan with; exclude fewer foods.")
+        foods = self.catalogue.nutrients[ids]
+
+        starts = [self._start(foods, targets, scale, max_items, max_servings), np.zeros(len(ids), dtype=np.int64)]
+        results = [self._improve(start, foods, targets, scale, max_items, max_servings) for start in starts]
+        servings, best = min(results, key=lambda result: result[1])
+
+        chosen = np.flatnonzero(servings)
+        order = chosen[np.argsort(-(servings[chosen, None] * foods[chosen])[:, 0])]
+        return MealPlan(ids[order], servings[order], servings @ foods, float(best))
+
+    def _improve(self, servings, foods, targets, scale, max_items, max_servings):
+        servings = servings.copy()
+        totals = servings @ foods
+        best = self._score(totals, targets, scale)
+        levels = np.arange(1, max_servings + 1)
+
+        for _ in range(MAX_STEPS):
+            chosen = np.flatnonzero(servings)
+            can_add = (servings < max_servings) & ((servings > 0) | (len(chosen) < max_items))
+
+            add = np.where(can_add, self._score(totals + foods, targets, scale), np.inf)
+            remove = np.where(servings > 0, self._score(totals - foods, targets, scale), np.inf)
+            moves = [(add.min(), "add", add.argmin()), (remove.min(), "remove", remove.argmin())]
+
+            # Replace all servings of one chosen food with 1..max_servings of another.
+            if len(chosen):
+                base = totals - servings[chosen, None] * foods[chosen]  # (chosen, nutrients)
+                replaced = base[:, None, None, :] + levels[None, None, :, None] * foods[None, :, None, :]
+                swap = self._score(replaced, targets, scale)
+                swap[:, servings > 0, :] = np.inf
+                k = np.unravel_index(swap.argmin(), swap.shape)
+                moves.append((swap[k], "swap", k))
+
+            score, kind, where = min(moves, key=lambda move: move[0])
+            if not score < best - 1e-12:
+                break
+            if kind == "add":
+                servings[where] += 1
+            elif kind == "remove":
+                servings[where] -= 1
+            else:
+                out, into, level = where
+                servings[chosen[out]] = 0
+                servings[into] = levels[level]
+            totals = servings @ foods
+            best = score
+        return servings, best
+
+
+# ---- Lower-Calorie Swaps ----
+class SwapIndex:
+    """Precomputed k nearest neighbours by per-100 g composition (protein, carbs, fat, fibre).
+
+    Neighbours are foods of the same kind -- grains with grains, fruit with fruit --
+    so the lower-calorie ones among them make sensible swaps.
+    """
+
+    def __init__(self, catalogue, k=10, chunk=1024):
+        self.catalogue = catalogue
+        per_100g = catalogue.nutrients[:, 1:] / catalogue.grams[:, None] * 100.0
+        ids = np.flatnonzero(~np.isnan(per_100g).any(axis=1))
+        features = per_100g[ids] / np.maximum(per_100g[ids].std(axis=0), 1e-9)
+        k = min(k, len(ids) - 1)
+
+        self.neighbours = np.zeros((len(ids), max(k, 0)), dtype=np.int64)
+        for lo in range(0, len(ids), chunk):
+            block = features[lo:lo + chunk]
+            distances = ((block[:, None, :] - features[None, :, :]) ** 2).sum(axis=-1)
+            distances[np.arange(len(block)), np.arange(lo, lo + len(block))] = np.inf
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k] if k > 0 else np.zeros((len(block), 0), int)
+            order = np.take_along_axis(distances, nearest, axis=1).argsort(axis=1)
+            self.neighbours[lo:lo + chunk] = ids[np.take_along_axis(nearest, order, axis=1)]
+        self._row = {int(food): row for row, food in enumerate(ids)}
+
+    def swaps(self, index, limit=3):
+        """Up to ``limit`` lower-calorie-per-serving neighbours of food ``index``, nearest first."""
+        row = self._row.get(int(index))
+        if row is None:
+            return []
+        calories = self.catalogue.calories
+        return [
+            Swap(int(food), float(calories[food]), float(calories[index] - calories[food]))
+            for food in self.neighbours[row]
+            if calories[food] < calories[index]
+        ][:limit]
+
+
+_swap_indexes = {}
+_swap_lock = threading.Lock()
+
+
+def get_swap_index(catalogue):
+    """``SwapIndex`` for ``catalogue``, built once per process per catalogue."""
+    key = catalogue.db.path
+    with _swap_lock:
+        cached = _swap_indexes.get(key)
+        if cached is None or cached.catalogue is not catalogue:
+            cached = _swap_indexes[key] = SwapIndex(catalogue)
+        return cached
@@ -0,0 +1,24 @@
+"""Which history a page reads and writes.
+
+By default every browser session gets its own random id, so logs stay private to
+that session the way the old per-session history was. Naming a profile opts in to a
+shared history: every session using that name sees it.
+"""
+import uuid
+
+PROFILE_LABEL = "Profile name (optional)"
+PROFILE_HELP = (
+    "Leave blank to keep your history private to this session. "
+    "Anyone who enters the same name shares its history."
+)
+
+
+def select_profile(state, name=""):
+    """Record the profile ``name`` in ``state`` (e.g. ``st.session_state``) and return the user id to log under.
+
+    A blank name falls back to the session's own random id, created on first use.
+    """
+    session_id = state.setdefault("session_user_id", uuid.uuid4().hex)
+    state["profile_name"] = name.strip()
+    state["user_id"] = state["profile_name"] or session_id
+    return state["user_id"]
@@ -0,0 +1,59 @@
+import time
+
+import cv2
+
+_UNSET = object()
+
+
+# ---- Throttled Renderer ----
+class ThrottledRenderer:
+    """Keeps Streamlit updates cheap: frames are rate-capped and JPEG-encoded once,
+    and other elements are only re-sent when their value actually changes.
+    """
+
+    def __init__(self, max_fps=15, jpeg_quality=70):
+        self.interval = 1.0 / max_fps
+        self.encode_params = [cv2.IMWRITE_JPEG_QUALITY, int(jpeg_quality)]
+        self._last_frame = float("-inf")
+        self._last_values = {}
+        self.frames_shown = 0
+        self.bytes_sent = 0
+
+    def frame_due(self, now=None):
+        """True when enough time has passed since the last displayed frame."""
+        now = time.perf_counter() if now is None else now
+        return now - self._last_frame >= self.interval
+
+    def encode(self, img, now=None):
+        """JPEG-encode a BGR frame and count it as shown; returns the bytes, or None on failure."""
+        ok, jpeg = cv2.imencode(".jpg", img, self.encode_params)
+        if not ok:
+            return None
+        data = jpeg.tobytes()
+        self._last_frame = time.perf_counter() if now is None else now
+        self.frames_shown += 1
+        self.bytes_sent += len(data)
+        return data
+
+    def show_frame(self, placeholder, img, now=None):
+        """JPEG-encode a BGR frame and push it to ``placeholder``."""
+        data = self.encode(img, now)
+        if data is not None:
+            placeholder.image(data, output_format="JPEG")
+
+    def update(self, placeholder, method, value):
+        """Call ``placeholder.<method>(value)`` only if ``value`` differs from the last call."""
+        key = (id(placeholder), method)
+        if self._last_values.get(key, _UNSET) == value:
+            return False
+        self._last_values[key] = value
+        getattr(placeholder, method)(value)
+        return True
+
+
+# ---- Frame Overlay ----
+def draw_overlay(img, count, unit, good_form):
+    """Draw the rep counter and form feedback onto a BGR frame in place."""
+    feedback = "Good form!" if good_form else "Adjust your posture!"
+    cv2.putText(img, feedback, (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    cv2.putText(img, f"{unit}: {int(count)}", (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
@@ -0,0 +1,203 @@
+"""Two-tier cache of chatbot replies keyed on the normalized conversation.
+
+* Exact tier: a hash of the model and the normalized payload (roles plus casefolded,
+  whitespace-collapsed content) -- "Suggest a Full-Body Workout" asked at the start of
+  any conversation is one key.
+* Similarity tier (optional): when a local embedding model is available
+  (``sentence-transformers``), a miss falls back to the closest cached question with
+  the same preceding conversation, if its cosine similarity clears ``similarity``.
+
+Entries live in a per-process LRU in front of a SQLite file under ``CACHE_DIR`` that
+every Streamlit process shares; both tiers expire entries after ``ttl`` seconds.
+"""
+import collections
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+from fitsphere.config import CACHE_DIR
+
+CACHE_PATH = os.path.join(CACHE_DIR, "chat_replies.db")
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_REFRESH = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS replies (
+    key TEXT PRIMARY KEY,
+    context TEXT NOT NULL,
+    question TEXT NOT NULL,
+    reply TEXT NOT NULL,
+    embedding BLOB,
+    created REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS replies_context ON replies (context);
+CREATE INDEX IF NOT EXISTS replies_used ON replies (used);
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """NFKC, casefold, collapse whitespace and drop trailing punctuation."""
+    text = _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+    return text.rstrip(" .!?…")
+
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def cache_keys(model, messages):
+    """``(key, context)``: the whole payload's hash and the hash of everything before its last message."""
+    normalized = [(m["role"], normalize_text(m["content"])) for m in messages]
+    return _digest(model, normalized), _digest(model, normalized[:-1])
+
+
+_embedders = {}
+_embedders_lock = threading.Lock()
+
+
+def get_embedder(model_name=DEFAULT_EMBEDDING_MODEL):
+    """Normalized sentence-embedding function, or None if sentence-transformers is not installed."""
+    with _embedders_lock:
+        if model_name not in _embedders:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError:
+                _embedders[model_name] = None
+            else:
+                model = SentenceTransformer(model_name)
+                _embedders[model_name] = lambda text: model.encode(text, normalize_embeddings=True).astype(np.float32)
+        return _embedders[model_name]
+
+
+# ---- Reply Cache ----
+class ReplyCache:
+    """LRU + TTL memory tier over a shared SQLite tier; thread- and process-safe."""
+
+    def __init__(self, path=CACHE_PATH, capacity=256, ttl=24 * 3600.0, max_rows=5000, embedder=None,
+                 similarity=0.92):
+        self.path = path
+        self.capacity = capacity
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.embedder = embedder
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self._memory = collections.OrderedDict()  # key -> (created, reply)
+        self._semantic = {}  # context -> (loaded_at, keys, matrix)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, created, reply):
+        with self._lock:
+            self._memory[key] = (created, reply)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.capacity:
+                self._memory.popitem(last=False)
+
+    # ---- Lookup ----
+    def get(self, model, messages):
+        """Cached reply for this payload, or None."""
+        key, context = cache_keys(model, messages)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+
+        reply = self._from_disk(key, now)
+        if reply is None and self.embedder is not None:
+            key = self._nearest(context, messages[-1]["content"], now)
+            reply = None if key is None else self._from_disk(key, now)
+        return reply
+
+    def _from_disk(self, key, now):
+        with self._connect() as conn:
+            row = conn.execute("SELECT created, reply FROM replies WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[0] >= self.ttl:
+                return None
+            conn.execute("UPDATE replies SET used = ? WHERE key = ?", (now, key))
+        self._remember(key, row[0], row[1])
+        return row[1]
+
+    def _nearest(self, context, question, now):
+        with self._lock:
+            cached = self._semantic.get(context)
+        if cached is None or now - cached[0] > SEMANTIC_REFRESH:
+            rows = self._connect().execute(
+                "SELECT key, embedding FROM replies WHERE context = ? AND embedding IS NOT NULL AND created > ?",
+                (context, now - self.ttl),
+            ).fetchall()
+            matrix = np.array([np.frombuffer(blob, dtype=np.float32) for _, blob in rows]) if rows else None
+            cached = (now, [key for key, _ in rows], matrix)
+            with self._lock:
+                self._semantic[context] = cached
+        _, keys, matrix = cached
+        if matrix is None:
+            return None
+        scores = matrix @ self.embedder(question)
+        best = int(np.argmax(scores))
+        return keys[best] if scores[best] >= self.similarity else None
+
+    # ---- Storing ----
+    def put(self, model, messages, reply):
+        key, context = cache_keys(model, messages)
+        now = time.time()
+        question = messages[-1]["content"]
+        embedding = self.embedder(question) if self.embedder is not None else None
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO replies (key, context, question, reply, embedding, created, used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, context, question, reply, None if embedding is None else embedding.tobytes(), now, now),
+            )
+            conn.execute("DELETE FROM replies WHERE created < ?", (now - self.ttl,))
+            conn.execute(
+                "DELETE FROM replies WHERE key IN (SELECT key FROM replies ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+        self._remember(key, now, reply)
+        if embedding is not None:
+            with self._lock:
+                cached = self._semantic.get(context)
+                if cached is not None:
+                    matrix = embedding[None] if cached[2] is None else np.vstack([cached[2], embedding])
+                    self._semantic[context] = (cached[0], cached[1] + [key], matrix)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_reply_cache(semantic=False, embedding_model=DEFAULT_EMBEDDING_MODEL, **options):
+    """Process-wide ``ReplyCache``; ``semantic`` enables the similarity tier when a local model is installed."""
+    embedder = get_embedder(embedding_model) if semantic else None
+    key = (embedder is not None, embedding_model)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ReplyCache(embedder=embedder, **options)
+        return cache
@@ -0,0 +1,66 @@
+import math
+
+
+def _missing(angle):
+    return angle is None or math.isnan(angle)
+
+
+# ---- Rep State Machine ----
+class RepCounter:
+    """Counts a half rep each time the joint angle crosses into the extended or flexed zone.
+
+    The state machine is table-driven: ``direction`` indexes the edge the angle must
+    cross next, so each update is a single comparison. ``hysteresis`` widens the
+    dead band between the two edges by that many degrees on each side, and a crossing
+    only counts once the angle has stayed past the edge for ``confirm_frames`` frames.
+    """
+
+    def __init__(self, up_threshold=160, down_threshold=100, hysteresis=0, confirm_frames=1):
+        self.up_threshold = up_threshold
+        self.down_threshold = down_threshold
+        # direction 0 waits to rise above the up edge, direction 1 to fall below the down edge.
+        self._edges = (up_threshold + hysteresis, -(down_threshold - hysteresis))
+        self._signs = (1, -1)
+        self.confirm_frames = confirm_frames
+        self._streak = 0
+        self.counter = 0
+        self.direction = 0
+
+    def update(self, angle, now=None):
+        if _missing(angle):
+            return self.counter
+        if self._signs[self.direction] * angle > self._edges[self.direction]:
+            self._streak += 1
+            if self._streak >= self.confirm_frames:
+                self.counter += 0.5
+                self.direction ^= 1
+                self._streak = 0
+        else:
+            self._streak = 0
+        return self.counter
+
+    @property
+    def reps(self):
+        return int(self.counter)
+
+
+# ---- Hold Timer ----
+class HoldTimer:
+    """Accumulates the seconds the joint angle stays above ``threshold`` (e.g. a plank)."""
+
+    def __init__(self, threshold=160):
+        self.threshold = threshold
+        self.counter = 0.0
+        self._held_since = None
+
+    def update(self, angle, now=None):
+        holding = not _missing(angle) and angle > self.threshold
+        if holding and self._held_since is not None and now is not None:
+            self.counter += now - self._held_since
+        self._held_since = now if holding else None
+        return self.counter
+
+    @property
+    def reps(self):
+        return int(self.counter)
+
@@ -0,0 +1,196 @@
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+from fitsphere.config import CACHE_DIR
+
+INDEX_VERSION = 1
+PREFIX_END = "\U0010ffff"
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Casefold, strip accents and collapse punctuation to single spaces."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fingerprint(names):
+    digest = hashlib.sha1()
+    for name in names:
+        digest.update(name.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# ---- Search Index ----
+class FoodSearchIndex:
+    """Typo-tolerant, ranked name search over the food catalogue.
+
+    Two structures are built once per catalogue:
+
+    * a sorted key array (every normalized name plus each of its later words) searched
+      with ``bisect`` -- a flattened prefix trie: one binary search finds the
+      contiguous block of keys sharing the query prefix;
+    * a trigram inverted index stored as CSR arrays (sorted grams, offsets, postings),
+      scored with one ``np.bincount`` per query.
+
+    Ranking: exact name > name prefix > word prefix, with trigram Jaccard similarity
+    breaking ties and catching typos; shorter names win remaining ties.
+    """
+
+    def __init__(self, names, keys, key_ids, key_is_name, grams, offsets, postings, gram_counts):
+        self.names = list(names)
+        self._keys = list(keys)
+        self._key_ids = key_ids
+        self._key_is_name = key_is_name
+        self._gram_slot = {gram: i for i, gram in enumerate(grams)}
+        self._grams = grams
+        self._offsets = offsets
+        self._postings = postings
+        self._gram_counts = gram_counts
+        self._name_lengths = np.array([len(name) for name in self.names], dtype=np.int32)
+        self.fingerprint = fingerprint(self.names)
+
+    @classmethod
+    def build(cls, names):
+        names = list(names)
+        normalized = [normalize(name) for name in names]
+
+        entries = []
+        for i, norm in enumerate(normalized):
+            entries.append((norm, i, True))
+            entries.extend((word, i, False) for word in norm.split()[1:])
+        entries.sort()
+        keys = [key for key, _, _ in entries]
+        key_ids = np.array([i for _, i, _ in entries], dtype=np.int32)
+        key_is_name = np.array([is_name for _, _, is_name in entries], dtype=bool)
+
+        postings_by_gram = {}
+        gram_counts = np.zeros(len(names), dtype=np.int32)
+        for i, norm in enumerate(normalized):
+            grams = trigrams(norm)
+            gram_counts[i] = len(grams)
+            for gram in grams:
+                postings_by_gram.setdefault(gram, []).append(i)
+        grams = sorted(postings_by_gram)
+        lengths = np.array([len(postings_by_gram[g]) for g in grams], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)))
+        postings = np.array([i for g in grams for i in postings_by_gram[g]], dtype=np.int32)
+
+        return cls(names, keys, key_ids, key_is_name, grams, offsets, postings, gram_counts)
+
+    # ---- Querying ----
+    def _prefix_range(self, prefix):
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + PREFIX_END, lo)
+        return lo, hi
+
+    def search(self, query, limit=20, min_similarity=0.2):
+        """Return up to ``limit`` catalogue names ranked by relevance to ``query``."""
+        q = normalize(query)
+        if not q:
+            return []
+
+        scores = np.zeros(len(self.names))
+
+        # Prefix matches: whole-name prefixes outrank later-word prefixes.
+        lo, hi = self._prefix_range(q)
+        if hi > lo:
+            ids = self._key_ids[lo:hi]
+            bonus = np.where(self._key_is_name[lo:hi], 2.0, 1.0)
+            np.maximum.at(scores, ids, bonus)
+            exact = [self._key_ids[j] for j in range(lo, hi) if self._key_is_name[j] and self._keys[j] == q]
+            scores[exact] = 3.0
+
+        # Trigram similarity for typo tolerance.
+        query_grams = trigrams(q)
+        slots = [self._gram_slot[g] for g in query_grams if g in self._gram_slot]
+        if slots:
+            hits = np.concatenate([self._postings[self._offsets[s]:self._offsets[s + 1]] for s in slots])
+            overlap = np.bincount(hits, minlength=len(self.names))
+            similarity = overlap / (len(query_grams) + self._gram_counts - overlap)
+            similarity[similarity < min_similarity] = 0.0
+            scores += similarity
+
+        candidates = np.flatnonzero(scores)
+        if not len(candidates):
+            return []
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        order = np.lexsort((self._name_lengths[candidates], -scores[candidates]))
+        return [self.names[i] for i in candidates[order]]
+
+    # ---- Serialization ----
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp,
+            version=INDEX_VERSION,
+            names=np.array(self.names),
+            keys=np.array(self._keys),
+            key_ids=self._key_ids,
+            key_is_name=self._key_is_name,
+            grams=np.array(self._grams),
+            offsets=self._offsets,
+            postings=self._postings,
+            gram_counts=self._gram_counts,
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                raise ValueError(f"Unsupported search index version in {path}")
+            return cls(
+                data["names"].tolist(), data["keys"].tolist(), data["key_ids"], data["key_is_name"],
+                data["grams"].tolist(), data["offsets"], data["postings"], data["gram_counts"],
+            )
+
+
+_indexes = {}
+_index_lock = threading.Lock()
+
+
+def get_search_index(names, cache_dir=CACHE_DIR):
+    """Index for ``names``, shared per process and persisted under ``cache_dir``.
+
+    The on-disk copy is keyed by a fingerprint of the names, so a changed catalogue
+    gets a fresh index instead of a stale one.
+    """
+    names = list(names)
+    key = fingerprint(names)
+    with _index_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            return index
+
+        path = os.path.join(cache_dir, f"food_search_{key[:16]}.npz")
+        index = None
+        if os.path.exists(path):
+            try:
+                index = FoodSearchIndex.load(path)
+            except (OSError, ValueError, KeyError):
+                index = None
+        if index is None or index.names != names:
+            index = FoodSearchIndex.build(names)
+            try:
+                index.save(path)
+            except OSError:
+                pass
+        _indexes[key] = index
+        return index
@@ -0,0 +1,44 @@
+from fitsphere.adaptive import SkipInterpolator
+from fitsphere.angles import AngleEngine
+
+
+# ---- Exercise Session ----
+class ExerciseSession:
+    """Per-session angle -> smoothing -> interpolation -> rep counting chain.
+
+    Shared by the live trainer and the benchmark harness so both measure and count
+    exactly the same way.
+    """
+
+    def __init__(self, exercise, weight):
+        self.exercise = exercise
+        self.weight = weight
+        self.engine = AngleEngine()
+        self.smoother = exercise.new_smoother()
+        self.interpolator = SkipInterpolator()
+        self.counter = exercise.new_counter()
+        self.angle = None
+
+    def process(self, landmarks, now, skipped=False):
+        """Feed one frame; ``landmarks`` is a cvzone list, a ``(33, 3)`` array, or None."""
+        if skipped:
+            self.interpolator.skipped()
+        else:
+            angles = None if landmarks is None else self.engine.compute(landmarks)
+            smoothed = self.smoother(angles, now)
+            for frame_angles in self.interpolator.inferred(smoothed):
+                self.counter.update(self.exercise.angle(frame_angles), now)
+        self.angle = self.exercise.angle(self.interpolator.last)
+        return self.counter.counter
+
+    @property
+    def count(self):
+        return self.counter.counter
+
+    @property
+    def calories(self):
+        return self.exercise.calories(self.counter.counter, self.weight)
+
+    @property
+    def good_form(self):
+        return self.exercise.good_form(self.angle)
@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+
+# ---- Median Prefilter ----
+class MedianRing:
+    """Running median over the last ``window`` samples of every joint.
+
+    Backed by a fixed ``(window, n)`` ring buffer, so a single-frame landmark glitch
+    is discarded before it reaches the low-pass filter.
+    """
+
+    def __init__(self, size, window=3):
+        self._ring = np.full((window, size), np.nan)
+        self._pos = 0
+        self._filled = 0
+        self._out = np.empty(size)
+
+    def reset(self):
+        self._ring.fill(np.nan)
+        self._pos = 0
+        self._filled = 0
+
+    def __call__(self, values):
+        self._ring[self._pos] = values
+        self._pos = (self._pos + 1) % len(self._ring)
+        self._filled = min(self._filled + 1, len(self._ring))
+        np.median(self._ring[:self._filled], axis=0, out=self._out)
+        return self._out
+
+
+# ---- One-Euro Filter ----
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """Vectorized One-Euro filter (Casiez et al.): smooth when still, responsive when moving.
+
+    ``min_cutoff`` (Hz) sets the jitter reduction at rest and ``beta`` how quickly the
+    cutoff rises with angular speed. State is one value and one derivative per joint.
+    """
+
+    def __init__(self, size, min_cutoff=1.0, beta=0.02, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._value = np.zeros(size)
+        self._deriv = np.zeros(size)
+        self._last_time = None
+
+    def reset(self):
+        self._last_time = None
+
+    def __call__(self, values, now):
+        if self._last_time is None or now <= self._last_time:
+            self._value[:] = values
+            self._deriv.fill(0.0)
+            self._last_time = now
+            return self._value
+
+        dt = now - self._last_time
+        self._last_time = now
+        deriv = (values - self._value) / dt
+        self._deriv += _alpha(self.d_cutoff, dt) * (deriv - self._deriv)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._deriv)
+        tau = 1.0 / (2 * np.pi * cutoff)
+        self._value += (values - self._value) / (1.0 + tau / dt)
+        return self._value
+
+
+# ---- Angle Smoother ----
+class AngleSmoother:
+    """Median prefilter followed by a One-Euro filter over the full joint-angle vector."""
+
+    def __init__(self, size, window=3, min_cutoff=1.0, beta=0.02):
+        self.median = MedianRing(size, window)
+        self.one_euro = OneEuroFilter(size, min_cutoff, beta)
+
+    def reset(self):
+        self.median.reset()
+        self.one_euro.reset()
+
+    def __call__(self, angles, now):
+        """Smooth one frame of angles; None (no pose) resets the filter and passes through."""
+        if angles is None:
+            self.reset()
+            return None
+        return self.one_euro(self.median(angles), now)
@@ -0,0 +1,58 @@
+"""Client-side countdown timers.
+
+The server only records when a timer ends (in the session's state); the countdown
+itself runs in the browser inside one HTML element, so no script thread sleeps or
+redraws per second. Each rerun re-renders the element with the time still left,
+which keeps the timer going across widget interactions.
+"""
+import json
+import time
+
+COUNTDOWN_TEMPLATE = """
+<div id="timer" style="font-family:sans-serif;font-size:1.6rem;font-weight:600;color:{color};padding:4px 0;"></div>
+<script>
+  const end = Date.now() + {remaining_ms};
+  const el = document.getElementById("timer");
+  const done = {done};
+  function pad(n) {{ return String(n).padStart(2, "0"); }}
+  function tick() {{
+    const left = Math.max(0, Math.ceil((end - Date.now()) / 1000));
+    if (left === 0) {{
+      el.textContent = done;
+      el.style.color = "{done_color}";
+      return;
+    }}
+    el.textContent = "Time Remaining: " + pad(Math.floor(left / 60)) + ":" + pad(left % 60);
+    setTimeout(tick, 250);
+  }}
+  tick();
+</script>
+"""
+
+
+def countdown_html(remaining, done_message="Time's up! Great job!", color="#FF4B4B", done_color="#21C354"):
+    """HTML for a countdown of ``remaining`` seconds that updates itself in the browser."""
+    return COUNTDOWN_TEMPLATE.format(
+        remaining_ms=max(0, int(remaining * 1000)),
+        done=json.dumps(done_message).replace("</", "<\\/"),
+        color=color,
+        done_color=done_color,
+    )
+
+
+# ---- Timer State ----
+def start_timer(state, key, seconds):
+    """Record in ``state`` (e.g. ``st.session_state``) that timer ``key`` ends ``seconds`` from now."""
+    state[key] = time.time() + seconds
+
+
+def stop_timer(state, key):
+    state.pop(key, None)
+
+
+def time_remaining(state, key):
+    """Seconds left on timer ``key`` (0 once finished), or None if it was never started or was stopped."""
+    ends_at = state.get(key)
+    if ends_at is None:
+        return None
+    return max(0.0, ends_at - time.time())
@@ -1,7 +1,13 @@
-import openai
 import toml
 import streamlit as st
 import os
+import time
+import uuid
+
+from fitsphere.chat import DEFAULT_BASE_URL, DEFAULT_MODEL, ChatError, get_chat_client
+from fitsphere.context import llm_summarizer
+from fitsphere.conversations import get_conversation_store
+from fitsphere.replycache import get_reply_cache
 
 # ---- CONFIGURE PAGE ----
 st.set_page_config(page_title="FIT-BOT Assistant", page_icon="🤖", layout="wide")
@@ -17,11 +23,33 @@ else:
     st.stop()
 
 # ---- Set OpenAI API Key ----
-openai.api_key = config.get("openai", {}).get("api_key")
-if not openai.api_key:
+openai_config = config.get("openai", {})
+api_key = openai_config.get("api_key")
+if not api_key:
     st.error("OpenAI API key not found in the configuration file. Please check secrets.toml.")
     st.stop()
 
+# One pooled client per process: reruns reuse its warm connections.
+# `base_url` can point at any OpenAI-compatible server (e.g. a local stand-in for testing).
+client = get_chat_client(
+    api_key,
+    base_url=openai_config.get("base_url", DEFAULT_BASE_URL),
+    model=openai_config.get("model", DEFAULT_MODEL),  # e.g. "gpt-4"
+    read_timeout=float(openai_config.get("timeout", 30)),
+    max_retries=int(openai_config.get("max_retries", 3)),
+)
+summarize = llm_summarizer(client)
+
+# ---- Reply cache ----
+# Shared by every session and process; quick replies and repeated questions skip the API.
+cache_config = config.get("cache", {})
+reply_cache = None
+if cache_config.get("enabled", True):
+    reply_cache = get_reply_cache(
+        semantic=bool(cache_config.get("semantic", False)),
+        ttl=float(cache_config.get("ttl_hours", 24)) * 3600,
+    )
+
 # ---- Base prompt for the chatbot ----
 BASE_PROMPT = [
     {"role": "system", "content": """
@@ -34,13 +62,28 @@ You respond in a short, conversational, and friendly style.
 """}
 ]
 
+# ---- Conversation store ----
+# Histories live in a bounded, process-wide store rather than in session state: each
+# session gets a copy of BASE_PROMPT, a message cap, and is evicted once idle.
+chatbot_config = config.get("chatbot", {})
+store = get_conversation_store(
+    max_messages=int(chatbot_config.get("max_messages", 200)),
+    idle_timeout=float(chatbot_config.get("idle_minutes", 60)) * 60,
+    max_sessions=int(chatbot_config.get("max_sessions", 1000)),
+    context_tokens=int(openai_config.get("context_tokens", 3000)),  # prompt + rolling summary + recent turns
+)
+
 # ---- Initialize session state ----
-if "messages" not in st.session_state:
-    st.session_state["messages"] = BASE_PROMPT
+if "conversation_id" not in st.session_state:
+    st.session_state["conversation_id"] = uuid.uuid4().hex
+conversation = store.get(st.session_state["conversation_id"], BASE_PROMPT)
 
 if "user_input" not in st.session_state:
     st.session_state["user_input"] = ""
 
+if "awaiting_reply" not in st.session_state:
+    st.session_state["awaiting_reply"] = False
+
 if "quick_replies" not in st.session_state:
     st.session_state["quick_replies"] = [
         "Suggest a Full-Body Workout",
@@ -52,7 +95,7 @@ if "quick_replies" not in st.session_state:
 
 # ---- Function to display conversation history dynamically ----
 def show_messages():
-    for msg in st.session_state["messages"][1:]:
+    for msg in conversation.messages[1:]:
         if msg["role"] == "user":
             st.markdown(f"**🧑‍💻 USER:** {msg['content']}")
         else:
@@ -65,23 +108,48 @@ def handle_input():
     if not user_message:
         return
 
-    # Add user message to conversation history
-    st.session_state["messages"].append({"role": "user", "content": user_message})
+    # Add user message to conversation history; the reply is streamed in the script body
+    conversation.append("user", user_message)
+    st.session_state["awaiting_reply"] = True
 
-    # Generate AI response
-    try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",  # Change to your desired model, e.g., "gpt-4"
-            messages=st.session_state["messages"]
-        )
-        bot_message = response["choices"][0]["message"]["content"]
-        st.session_state["messages"].append({"role": "assistant", "content": bot_message})
-    except Exception as e:
-        st.error(f"An error occurred: {str(e)}")
-    
     # Clear user input field
     st.session_state.user_input = ""
 
+# ---- Function to stream the AI response ----
+def stream_reply():
+    st.session_state["awaiting_reply"] = False
+    placeholder = st.empty()
+    placeholder.markdown("**🤖 BOT:** ...")
+    bot_message = ""
+    started = time.perf_counter()
+    first_token = None
+    payload = conversation.payload(summarize)  # a failed summary is logged and the old turns dropped
+    cached = reply_cache.get(client.model, payload) if reply_cache is not None else None
+    if cached is not None:
+        bot_message, first_token = cached, time.perf_counter() - started
+    else:
+        try:
+            for token in client.stream(payload):
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                bot_message += token
+                placeholder.markdown(f"**🤖 BOT:** {bot_message}▌")
+        except ChatError as e:
+            st.error(f"An error occurred: {str(e)}")
+        else:
+            if bot_message and reply_cache is not None:
+                reply_cache.put(client.model, payload, bot_message)
+    if bot_message:
+        placeholder.markdown(f"**🤖 BOT:** {bot_message}")
+        conversation.append("assistant", bot_message)
+        source = "cache" if cached is not None else "model"
+        st.caption(
+            f"First token in {first_token * 1000:.0f} ms, full reply in {time.perf_counter() - started:.1f} s ({source})"
+        )
+    else:
+        placeholder.empty()
+    st.markdown("---")
+
 # ---- Function to handle quick replies ----
 def handle_quick_reply(reply):
     st.session_state["user_input"] = reply
@@ -94,6 +162,8 @@ st.markdown("---")
 
 # ---- Display conversation history ----
 show_messages()
+if st.session_state["awaiting_reply"]:
+    stream_reply()
 
 # ---- Input Section ----
 st.text_input("Your message:", key="user_input", on_change=handle_input, placeholder="Type your message here...")
@@ -103,8 +173,7 @@ st.write("**Quick Suggestions:**")
 cols = st.columns(5)
 for i, reply in enumerate(st.session_state["quick_replies"]):
     with cols[i % 5]:
-        if st.button(reply, key=f"quick_reply_{i}"):
-            handle_quick_reply(reply)
+        st.button(reply, key=f"quick_reply_{i}", on_click=handle_quick_reply, args=(reply,))
 
 # ---- Feedback Section ----
 st.markdown("---")
@@ -119,6 +188,14 @@ with cols_feedback[1]:
 
 # ---- Reset Conversation ----
 if st.button("Reset Conversation"):
-    st.session_state["messages"] = BASE_PROMPT
+    conversation.reset()
     st.session_state.user_input = ""
     st.info("Conversation has been reset.")
+
+# ---- Operator Stats ----
+if chatbot_config.get("show_store_stats", False):
+    with st.sidebar.expander("Conversation store"):
+        stats = store.stats()
+        st.write(f"**Sessions:** {stats['sessions']} (evicted {stats['evicted']})")
+        st.write(f"**Messages held:** {stats['messages']}")
+        st.write(f"**Message memory:** {stats['bytes'] / 1024:.1f} KiB")
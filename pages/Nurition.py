@@ -2,20 +2,31 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import datetime
+import numpy as np
+
+from fitsphere.foods import NUTRIENTS, CatalogueError, get_catalogue
+from fitsphere.logstore import get_log_store
+from fitsphere.meals import as_dict, meal_totals
+from fitsphere.planner import MealPlanner, get_swap_index, macro_targets
+from fitsphere.profile import PROFILE_HELP, PROFILE_LABEL, select_profile
 
 # ---- PAGE CONFIG ----
 st.set_page_config(page_title="Smart Nutrition Tracker", page_icon="🥗", layout="wide")
 
 # ---- LOAD DATA ----
-df = pd.read_csv("./food.csv", encoding='mac_roman')
-
-# Check for required columns
-required_columns = ["Food", "Serving", "Calories"]
-if not all(col in df.columns for col in required_columns):
-    st.error("Dataset must include 'Food', 'Serving', and 'Calories' columns.")
+# Parsed once per process and shared by every session; reloaded only if food.csv changes.
+try:
+    catalogue = get_catalogue("./food.csv")
+except CatalogueError as e:
+    st.error(str(e))
     st.stop()
 
+# ---- USER PROFILE ----
+select_profile(
+    st.session_state,
+    st.sidebar.text_input(PROFILE_LABEL, value=st.session_state.get("profile_name", ""), help=PROFILE_HELP),
+)
+
 # ---- PAGE TITLE ----
 st.title("Smart Nutrition Tracker 🥗")
 st.markdown("### Your companion for personalized nutrition insights.")
@@ -24,18 +35,25 @@ st.markdown("### Your companion for personalized nutrition insights.")
 num_dishes = st.number_input("Enter Number of Dishes 🍽️", min_value=1, max_value=10, value=1, step=1)
 
 # ---- TRACKING VARIABLES ----
-total_calories = 0
 selected_foods = []
-calorie_breakdown = []
-nutrient_summary = {"Protein": 0, "Carbs": 0, "Fat": 0}
+selected_indices = []
+selected_servings = []
 
 # ---- FOOD TRACKER ----
 st.write("## Add Your Meals")
 for i in range(int(num_dishes)):
     st.write(f"### Dish {i + 1}")
+    query = st.text_input(f"Search foods for Dish {i + 1}", key=f"search_{i}", placeholder="e.g. chicken, brwn rice")
+    food_options = catalogue.options
+    if query:
+        matches = catalogue.search_index.search(query, limit=25)
+        if matches:
+            food_options = matches
+        else:
+            st.caption(f"No foods match '{query}'. Showing the full list.")
     food_selected = st.selectbox(
         f"Select Food Item for Dish {i + 1}",
-        df['Food'].unique(),
+        food_options,
         key=f"food_{i}"
     )
     
@@ -46,30 +64,36 @@ for i in range(int(num_dishes)):
         )
         
         # Fetch data for the selected food
-        food_data = df[df["Food"] == food_selected].iloc[0]
-        calories = food_data["Calories"] * servings
-        
-        # Update tracking variables
-        total_calories += calories
+        food_data = catalogue.get(food_selected)
         selected_foods.append(food_selected)
-        calorie_breakdown.append(calories)
-
-        # Optional nutrient breakdown (mock data for uniqueness)
-        nutrient_summary["Protein"] += servings * 5  # Example: Assume 5g protein per serving
-        nutrient_summary["Carbs"] += servings * 10  # Example: Assume 10g carbs per serving
-        nutrient_summary["Fat"] += servings * 2  # Example: Assume 2g fat per serving
+        selected_indices.append(catalogue.index_of(food_selected))
+        selected_servings.append(servings)
 
         # Display food details
-        st.write(f"**Food Item:** {food_selected}")
-        st.write(f"**Calories per Serving:** {food_data['Calories']} kcal")
-        st.write(f"**Total Calories for {servings} Serving(s):** {calories} kcal")
+        st.write(f"**Food Item:** {food_selected} ({food_data.serving})")
+        st.write(f"**Calories per Serving:** {food_data.calories:g} kcal")
+        st.write(f"**Total Calories for {servings} Serving(s):** {food_data.calories * servings:g} kcal")
+        if food_data.protein == food_data.protein:  # NaN when no macro data
+            st.caption(
+                f"Per serving: {food_data.protein:.1f} g protein · {food_data.carbs:.1f} g carbs · "
+                f"{food_data.fat:.1f} g fat · {food_data.fibre:.1f} g fibre"
+            )
 
 # ---- SUMMARY ----
+# One gather + weighted sum over every dish (see fitsphere.meals).
+meal = meal_totals(catalogue, selected_indices, selected_servings)
+summary = as_dict(meal.totals)
+total_calories = summary["calories"]
+calorie_breakdown = meal.per_item[:, 0].tolist()
+nutrient_summary = {"Protein": summary["protein"], "Carbs": summary["carbs"], "Fat": summary["fat"], "Fibre": summary["fibre"]}
+
 st.write("## Summary")
-st.metric("Total Calories Consumed", f"{total_calories} kcal")
-st.write(f"**Total Protein:** {nutrient_summary['Protein']} g")
-st.write(f"**Total Carbs:** {nutrient_summary['Carbs']} g")
-st.write(f"**Total Fat:** {nutrient_summary['Fat']} g")
+st.metric("Total Calories Consumed", f"{total_calories:g} kcal")
+for nutrient, grams in nutrient_summary.items():
+    st.write(f"**Total {nutrient}:** {grams:.1f} g")
+unknown = [food for food, missing in zip(selected_foods, meal.missing) if missing]
+if unknown:
+    st.caption(f"No macronutrient data for: {', '.join(unknown)}. Their calories are counted, their macros are not.")
 
 # ---- VISUALIZATIONS ----
 if selected_foods:
@@ -86,9 +110,7 @@ if selected_foods:
     # Nutrient Breakdown
     st.write("### Nutrient Breakdown")
     nutrients_chart = go.Figure(data=[
-        go.Bar(name="Protein", x=["Protein"], y=[nutrient_summary["Protein"]]),
-        go.Bar(name="Carbs", x=["Carbs"], y=[nutrient_summary["Carbs"]]),
-        go.Bar(name="Fat", x=["Fat"], y=[nutrient_summary["Fat"]]),
+        go.Bar(name=nutrient, x=[nutrient], y=[grams]) for nutrient, grams in nutrient_summary.items()
     ])
     nutrients_chart.update_layout(barmode='group', title="Nutrient Breakdown")
     st.plotly_chart(nutrients_chart)
@@ -97,19 +119,30 @@ if selected_foods:
 st.write("## Daily Calorie Goal Tracker 🎯")
 calorie_goal = st.number_input("Set Your Daily Calorie Goal (kcal):", min_value=500, max_value=5000, value=2000)
 if total_calories > calorie_goal:
-    st.warning(f"You've exceeded your calorie goal by {total_calories - calorie_goal} kcal.")
+    st.warning(f"You've exceeded your calorie goal by {total_calories - calorie_goal:g} kcal.")
 else:
-    st.success(f"You're within your calorie goal! {calorie_goal - total_calories} kcal remaining.")
+    st.success(f"You're within your calorie goal! {calorie_goal - total_calories:g} kcal remaining.")
 
 # ---- ADDITIONAL FEATURES ----
 st.write("## Additional Features")
 # Save Meal Plan
+log_store = get_log_store()
 if st.button("Save Your Meal Plan"):
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    filename = f"meal_plan_{timestamp}.csv"
-    meal_plan_df = pd.DataFrame({"Food": selected_foods, "Calories": calorie_breakdown})
-    meal_plan_df.to_csv(filename, index=False)
-    st.success(f"Meal plan saved as {filename}.")
+    items = [
+        dict(zip(NUTRIENTS, row), food=food, servings=servings)
+        for food, servings, row in zip(selected_foods, selected_servings, meal.per_item.tolist())
+    ]
+    saved = log_store.append_meals(st.session_state.user_id, items)
+    st.success(f"Saved {saved} item(s) to your meal log.")
+
+# The export is built in memory, and only when asked for.
+if st.button("Prepare Meal Log Download"):
+    st.download_button(
+        label="Download Meal Log",
+        data=log_store.export_csv("meals", st.session_state.user_id),
+        file_name="meal_log.csv",
+        mime="text/csv"
+    )
 
 # Recommendations
 st.write("### Personalized Recommendations")
@@ -118,6 +151,49 @@ if total_calories > calorie_goal:
 else:
     st.info("Great job! Keep up the good work with balanced meals.")
 
+swap_index = get_swap_index(catalogue)
+for food, index in zip(selected_foods, selected_indices):
+    swaps = swap_index.swaps(index)
+    if swaps:
+        options = ", ".join(f"{catalogue.names[s.index]} ({s.calories:g} kcal, -{s.saving:g})" for s in swaps)
+        st.write(f"**Swap {food}** ({catalogue.calories[index]:g} kcal) for: {options}")
+
+# ---- MEAL PLANNER ----
+st.write("## Meal Planner 🧮")
+st.write("Build a day of meals that hits your calorie goal and macro split.")
+split_cols = st.columns(4)
+protein_pct = split_cols[0].number_input("Protein (% kcal)", min_value=0, max_value=100, value=30, step=5)
+carbs_pct = split_cols[1].number_input("Carbs (% kcal)", min_value=0, max_value=100, value=40, step=5)
+fat_pct = split_cols[2].number_input("Fat (% kcal)", min_value=0, max_value=100, value=30, step=5)
+fibre_goal = split_cols[3].number_input("Fibre (g, minimum)", min_value=0, max_value=100, value=30, step=5)
+limit_cols = st.columns(2)
+max_items = limit_cols[0].slider("Max Different Foods", min_value=1, max_value=10, value=6)
+max_servings = limit_cols[1].slider("Max Servings per Food", min_value=1, max_value=5, value=3)
+excluded = st.multiselect("Exclude Foods", catalogue.options)
+
+if st.button("Plan My Day"):
+    if protein_pct + carbs_pct + fat_pct == 0:
+        st.error("Set at least one macro percentage above zero.")
+    else:
+        targets = macro_targets(calorie_goal, protein_pct, carbs_pct, fat_pct, fibre_goal)
+        try:
+            plan = MealPlanner(catalogue).plan(targets, max_items, max_servings, excluded)
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
+        plan_df = pd.DataFrame(
+            catalogue.nutrients[plan.indices] * plan.servings[:, None],
+            columns=["Calories", "Protein (g)", "Carbs (g)", "Fat (g)", "Fibre (g)"],
+        ).round(1)
+        plan_df.insert(0, "Servings", plan.servings)
+        plan_df.insert(0, "Serving", [catalogue.db.serving(i) for i in plan.indices])
+        plan_df.insert(0, "Food", [catalogue.names[i] for i in plan.indices])
+        st.dataframe(plan_df, hide_index=True)
+        st.table(pd.DataFrame(
+            {"Planned": np.round(plan.totals, 1), "Target": np.round(targets, 1)},
+            index=["Calories (kcal)", "Protein (g)", "Carbs (g)", "Fat (g)", "Fibre (g)"],
+        ))
+
 # ---- FOOTER ----
 st.markdown("""
 ---
@@ -1,12 +1,22 @@
 import streamlit as st
 import cv2
-from cvzone.PoseModule import PoseDetector
-import math
 import numpy as np
 import plotly.graph_objects as go
 import pandas as pd
 import time
 import os
+import tempfile
+
+from fitsphere.adaptive import AdaptiveController
+from fitsphere.detectors import DetectorPoolExhausted, get_detector_pool, warm_up_in_background
+from fitsphere.exercises import get_exercises
+from fitsphere.instrumentation import NULL_TRACER, Tracer, format_overlay
+from fitsphere.logstore import get_log_store
+from fitsphere.offline import analyze_video
+from fitsphere.pipeline import FramePipeline
+from fitsphere.profile import PROFILE_HELP, PROFILE_LABEL, select_profile
+from fitsphere.render import ThrottledRenderer, draw_overlay
+from fitsphere.session import ExerciseSession
 
 # ---- Initialize Session State Variables ----
 if "exercise_type" not in st.session_state:
@@ -15,93 +25,102 @@ if "counter" not in st.session_state:
     st.session_state.counter = 0
 if "direction" not in st.session_state:
     st.session_state.direction = 0
-if "workout_history" not in st.session_state:
-    st.session_state.workout_history = []
-
-# ---- Angle Finder Class ----
-class AngleFinder:
-    def __init__(self, lmlist, p1, p2, p3):
-        self.lmlist = lmlist
-        self.p1 = p1
-        self.p2 = p2
-        self.p3 = p3
-
-    def calculate_angle(self):
-        if len(self.lmlist) != 0:
-            try:
-                x1, y1 = self.lmlist[self.p1][1:3]
-                x2, y2 = self.lmlist[self.p2][1:3]
-                x3, y3 = self.lmlist[self.p3][1:3]
-                angle = math.degrees(math.atan2(y3 - y2, x3 - x2) - math.atan2(y1 - y2, x1 - x2))
-                return abs(angle)
-            except (IndexError, ValueError):
-                return None
-        return None
+select_profile(
+    st.session_state,
+    st.sidebar.text_input(PROFILE_LABEL, value=st.session_state.get("profile_name", ""), help=PROFILE_HELP),
+)
 
 # ---- Start Exercise ----
-def start_exercise(detector, exercise_name, angle_indices, goal_calories, weight):
+def format_stage_timings(timings):
+    return " | ".join(f"{stage}: {t['ms']:.1f} ms ({t['fps']:.1f}/s)" for stage, t in timings.items())
+
+def format_perf_panel(stats):
+    lines = [f"**FPS:** {stats.get('fps', 0.0):.1f}"]
+    for stage, values in stats.items():
+        if stage != "fps":
+            lines.append(f"- **{stage}:** p50 {values['p50']:.1f} ms · p95 {values['p95']:.1f} ms")
+    return "\n".join(lines)
+
+def start_exercise(detector, exercise, goal_calories, weight, target_fps=15, display_fps=12, jpeg_quality=70,
+                   instrument=False):
     cap = cv2.VideoCapture(0)
-    counter = 0
-    direction = 0
+    tracer = Tracer() if instrument else NULL_TRACER
+    perf_panel = st.sidebar.empty() if instrument else None
+    overlay_text = ""
+    renderer = ThrottledRenderer(max_fps=display_fps, jpeg_quality=jpeg_quality)
+    controller = AdaptiveController(target_fps=target_fps)
+    session = ExerciseSession(exercise, weight)
     start_time = time.time()
     frame_placeholder = st.empty()
     progress_placeholder = st.empty()
+    reps_placeholder = st.empty()
+    stats_placeholder = st.empty()
+    last_stats_update = 0
+    frames_processed = 0
 
-    while cap.isOpened():
-        ret, img = cap.read()
-        if not ret:
-            break
-
-        img = cv2.resize(img, (640, 480))
-        detector.findPose(img, draw=False)
-        lmList, _ = detector.findPosition(img, draw=False)
+    with FramePipeline(cap, detector, controller=controller, tracer=tracer) as pipeline:
+        for result in pipeline.results():
+            render_start = time.perf_counter()
+            frames_processed += 1
 
-        angle_finder = AngleFinder(lmList, *angle_indices)
-        angle = angle_finder.calculate_angle()
+            # Skipped frames get interpolated angles once the next inferred frame arrives.
+            counter = session.process(result.lmlist, result.captured_at, result.skipped)
+            pipeline.timings.record("angle", time.perf_counter() - render_start, render_start)
 
-        if angle is not None:
-            if angle > 160 and direction == 0:
-                counter += 0.5
-                direction = 1
-            if angle < 100 and direction == 1:
-                counter += 0.5
-                direction = 0
+            # Progress Tracker
+            calories_burned = session.calories
+            progress = min(calories_burned / goal_calories * 100, 100)
+            renderer.update(progress_placeholder, "progress", int(progress))
+            renderer.update(reps_placeholder, "markdown", f"**{exercise.unit}:** {int(counter)}")
 
-        # Real-Time Feedback
-        feedback = "Good form!" if angle is not None and angle > 160 else "Adjust your posture!"
-        cv2.putText(img, feedback, (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            # Overlay and display only the frames that will actually be sent to the browser
+            if renderer.frame_due(render_start):
+                draw_overlay(result.img, counter, exercise.unit, session.good_form)
+                if tracer.enabled:
+                    cv2.putText(result.img, overlay_text, (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+                renderer.show_frame(frame_placeholder, result.img, render_start)
+            pipeline.record_render(time.perf_counter() - render_start, result.captured_at)
 
-        # Display Counter
-        cv2.putText(img, f"Reps: {int(counter)}", (10, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        frame_placeholder.image(img)
+            # Pipeline Timings (refreshed at most once per second)
+            if render_start - last_stats_update >= 1:
+                stats_placeholder.caption(
+                    f"{format_stage_timings(pipeline.timings.snapshot())} | "
+                    f"inference scale: {controller.scale:.2f}, skip: {controller.skip} | "
+                    f"video: {renderer.frames_shown} frames, {renderer.bytes_sent / 1024:.0f} KB sent"
+                )
+                last_stats_update = render_start
+                if tracer.enabled:
+                    perf_stats = tracer.stats()
+                    overlay_text = format_overlay(perf_stats)
+                    perf_panel.markdown(format_perf_panel(perf_stats))
 
-        # Progress Tracker
-        calories_burned = counter * weight * 0.1
-        progress = min(calories_burned / goal_calories * 100, 100)
-        progress_placeholder.progress(int(progress))
+            if st.session_state.exercise_type == "Stop" or progress >= 100:
+                break
 
-        if st.session_state.exercise_type == "Stop" or progress >= 100:
-            break
-
-    cap.release()
     cv2.destroyAllWindows()
     duration = time.time() - start_time
-    show_analytics(counter, calories_burned, goal_calories, exercise_name, duration)
+    show_analytics(session.count, session.calories, goal_calories, exercise.name, duration, frames_processed)
+    if tracer.enabled:
+        st.download_button(
+            label="Download Performance Trace",
+            data=tracer.chrome_trace(),
+            file_name=f"trace_{exercise.name.replace(' ', '_').lower()}.json",
+            mime="application/json"
+        )
 
 # ---- Show Analytics ----
-def show_analytics(counter, calories_burned, goal_calories, exercise_name, duration):
+def show_analytics(counter, calories_burned, goal_calories, exercise_name, duration, frames):
+    if not frames:
+        # Camera failed to open or the clip had no readable frames: nothing to log.
+        st.warning("No video frames were processed, so this session was not saved. Check your camera or file.")
+        return
+
     st.write(f"### Workout Summary: {exercise_name}")
     st.write(f"**Reps Completed:** {int(counter)}")
     st.write(f"**Calories Burned:** {calories_burned:.2f} kcal")
     st.write(f"**Time Taken:** {int(duration // 60)} min {int(duration % 60)} sec")
 
-    st.session_state.workout_history.append({
-        "Exercise": exercise_name,
-        "Reps": int(counter),
-        "Calories Burned": round(calories_burned, 2),
-        "Time Taken (min)": round(duration / 60, 2)
-    })
+    get_log_store().append_workout(st.session_state.user_id, exercise_name, counter, calories_burned, duration)
 
     # Bar Chart
     fig = go.Figure(data=[
@@ -112,30 +131,88 @@ def show_analytics(counter, calories_burned, goal_calories, exercise_name, durat
     st.plotly_chart(fig)
 
 # ---- Workout History Viewer ----
-def show_workout_history():
-    if st.session_state.workout_history:
-        st.write("### Workout History")
-        history_df = pd.DataFrame(st.session_state.workout_history)
-        st.dataframe(history_df)
-
-        csv_path = "workout_history.csv"
-        history_df.to_csv(csv_path, index=False)
-        with open(csv_path, "rb") as file:
-            st.download_button(
-                label="Download Workout History",
-                data=file,
-                file_name="workout_history.csv",
-                mime="text/csv"
-            )
-    else:
+def show_workout_history(limit=10, weeks=12):
+    # Summaries come from the store's precomputed rollups and only the latest sessions
+    # are read raw, so the page costs the same however long the history is.
+    store = get_log_store()
+    user_id = st.session_state.user_id
+    totals = store.rollups(user_id, "all")
+    if not len(totals):
         st.write("No workout history available. Start your first session!")
+        return
+
+    st.write("### Workout History")
+    cols = st.columns(4)
+    cols[0].metric("Sessions", int(totals["sessions"].sum()))
+    cols[1].metric("Total Reps", int(totals["reps"].sum()))
+    cols[2].metric("Calories Burned", f"{totals['calories'].sum():.0f} kcal")
+    cols[3].metric("Time Trained", f"{totals['duration'].sum() / 60:.0f} min")
+
+    monday = pd.Timestamp.today().normalize() - pd.Timedelta(days=pd.Timestamp.today().weekday())
+    since = (monday - pd.Timedelta(weeks=weeks - 1)).strftime("%Y-%m-%d")
+    weekly = store.rollups(user_id, "week", since=since).sort_values("period")
+    fig = go.Figure([
+        go.Bar(x=rows["period"], y=rows["calories"].round(2), name=exercise)
+        for exercise, rows in weekly.groupby("exercise")
+    ])
+    fig.update_layout(
+        barmode="stack", title=f"Calories Burned per Week (last {weeks} weeks)",
+        xaxis_title="Week of", yaxis_title="Calories (kcal)",
+    )
+    st.plotly_chart(fig)
+
+    st.write("#### By Exercise")
+    st.dataframe(pd.DataFrame({
+        "Exercise": totals["exercise"],
+        "Sessions": totals["sessions"],
+        "Reps": totals["reps"],
+        "Calories Burned": totals["calories"].round(2),
+        "Time Taken (min)": (totals["duration"] / 60).round(2),
+    }), hide_index=True)
+
+    history = store.read("workouts", user_id, limit=limit)
+    st.write("#### Recent Sessions")
+    st.dataframe(pd.DataFrame({
+        "Date": history["logged_at"].dt.strftime("%Y-%m-%d %H:%M"),
+        "Exercise": history["exercise"],
+        "Reps": history["reps"],
+        "Calories Burned": history["calories"].round(2),
+        "Time Taken (min)": (history["duration"] / 60).round(2),
+    }), hide_index=True)
+
+    # The export is built in memory, and only when asked for.
+    if st.button("Prepare Workout History Download"):
+        st.download_button(
+            label="Download Workout History",
+            data=store.export_csv("workouts", user_id),
+            file_name="workout_history.csv",
+            mime="text/csv"
+        )
+
+# ---- Recorded Video Analysis ----
+def analyze_recording(uploaded_file, exercise, goal_calories, weight):
+    suffix = os.path.splitext(uploaded_file.name)[1] or ".mp4"
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
+        tmp.write(uploaded_file.getbuffer())
+        video_path = tmp.name
+    try:
+        with st.spinner("Analyzing your recording..."):
+            result = analyze_video(video_path, exercise.name)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    finally:
+        os.remove(video_path)
+
+    calories_burned = exercise.calories(result.reps, weight)
+    show_analytics(result.reps, calories_burned, goal_calories, exercise.name, result.duration, len(result.angles))
 
 # ---- Main Program ----
+warm_up_in_background(detection_con=0.7, track_con=0.7)
+
 st.title("Advanced AI Fitness Trainer 🏋️")
-exercise = st.sidebar.selectbox(
-    "Choose an Exercise",
-    ["About", "Squats", "Pushups", "Left Dumbbell", "Right Dumbbell", "Plank", "Jumping Jacks"]
-)
+exercises = get_exercises()
+exercise = st.sidebar.selectbox("Choose an Exercise", ["About", *exercises])
 
 if exercise == "About":
     st.header("Welcome to AI Fitness Trainer!")
@@ -148,27 +225,32 @@ if exercise == "About":
 else:
     weight = st.slider("Enter your weight (kg):", 20, 150, 70)
     goal_calories = st.slider("Set a calorie goal:", 10, 500, 50)
+    target_fps = st.sidebar.slider("Target frame rate (FPS):", 5, 30, 15)
+    display_fps = st.sidebar.slider("Video refresh rate (FPS):", 1, 30, 12)
+    jpeg_quality = st.sidebar.slider("Video quality (JPEG):", 30, 95, 70)
+    instrument = st.sidebar.checkbox("Show performance overlay", value=False)
+
+    source = st.radio("Input source:", ["Webcam", "Video file"], horizontal=True)
 
-    if st.button("Start"):
-        st.session_state.exercise_type = "Start"
-    if st.button("Stop"):
-        st.session_state.exercise_type = "Stop"
-
-    detector = PoseDetector(detectionCon=0.7, trackCon=0.7)
-
-    if st.session_state.exercise_type == "Start":
-        if exercise == "Squats":
-            start_exercise(detector, "Squats", [24, 26, 28], goal_calories, weight)
-        elif exercise == "Pushups":
-            start_exercise(detector, "Pushups", [11, 13, 15], goal_calories, weight)
-        elif exercise == "Left Dumbbell":
-            start_exercise(detector, "Left Dumbbell", [11, 13, 15], goal_calories, weight)
-        elif exercise == "Right Dumbbell":
-            start_exercise(detector, "Right Dumbbell", [12, 14, 16], goal_calories, weight)
-        elif exercise == "Plank":
-            start_exercise(detector, "Plank", [11, 13, 15], goal_calories, weight)
-        elif exercise == "Jumping Jacks":
-            start_exercise(detector, "Jumping Jacks", [24, 26, 28], goal_calories, weight)
+    if source == "Video file":
+        uploaded_file = st.file_uploader("Upload a workout recording", type=["mp4", "mov", "avi", "mkv"])
+        if uploaded_file is not None and st.button("Analyze Recording"):
+            analyze_recording(uploaded_file, exercises[exercise], goal_calories, weight)
+    else:
+        if st.button("Start"):
+            st.session_state.exercise_type = "Start"
+        if st.button("Stop"):
+            st.session_state.exercise_type = "Stop"
+
+        if st.session_state.exercise_type == "Start":
+            try:
+                with get_detector_pool().checkout(detection_con=0.7, track_con=0.7) as detector:
+                    start_exercise(
+                        detector, exercises[exercise], goal_calories, weight, target_fps, display_fps, jpeg_quality,
+                        instrument
+                    )
+            except DetectorPoolExhausted as e:
+                st.error(str(e))
 
 # Display Workout History
 show_workout_history()
@@ -1,8 +1,10 @@
 import streamlit as st
-from PIL import Image
-import time
+import streamlit.components.v1 as components
 import os
 
+from fitsphere.media import get_media_library
+from fitsphere.timer import countdown_html, start_timer, stop_timer, time_remaining
+
 # ---- PAGE HEADER ----
 html = """
 <div style="background-color:#025246 ;padding:10px">
@@ -11,10 +13,22 @@ html = """
 st.markdown(html, unsafe_allow_html=True)
 
 # ---- LOAD IMAGES ----
-img1 = Image.open("./images/dumbbell.webp")
-img2 = Image.open("./images/squats.jpg")
-img3 = Image.open("./images/pushups.jpeg")
-img4 = Image.open("./images/shoulder.jpeg")
+# Pre-sized WebP variants offered through srcset; until they are built in the
+# background the originals are shown instead (see fitsphere.media).
+media = get_media_library()
+img1 = "./images/dumbbell.webp"
+img2 = "./images/squats.jpg"
+img3 = "./images/pushups.jpeg"
+img4 = "./images/shoulder.jpeg"
+
+def show_media(path, animated=False, caption=None, sizes="100vw"):
+    tag = media.image_html(path, animated, alt=caption or "", sizes=sizes)
+    if tag is None:
+        st.image(path, caption=caption, use_container_width=True)
+    else:
+        st.markdown(tag, unsafe_allow_html=True)
+        if caption:
+            st.caption(caption)
 
 # ---- ACHIEVEMENTS ----
 achievements = {
@@ -39,12 +53,16 @@ app_mode = st.sidebar.selectbox(
 # ---- EXERCISE BENEFITS & TIMER FUNCTION ----
 def display_timer():
     minutes = st.number_input("Set Timer (Minutes):", min_value=1, max_value=30, value=1)
-    if st.button("Start Timer"):
-        for i in range(minutes * 60, -1, -1):
-            mins, secs = divmod(i, 60)
-            st.write(f"Time Remaining: {mins:02}:{secs:02}")
-            time.sleep(1)
-        st.success("Time's up! Great job!")
+    start_col, stop_col = st.columns(2)
+    if start_col.button("Start Timer"):
+        start_timer(st.session_state, "tutorial_timer", minutes * 60)
+    if stop_col.button("Stop Timer"):
+        stop_timer(st.session_state, "tutorial_timer")
+
+    # Counts down client-side in a single element; no script thread is held.
+    seconds_left = time_remaining(st.session_state, "tutorial_timer")
+    if seconds_left is not None:
+        components.html(countdown_html(seconds_left), height=60)
 
 def exercise_benefits(benefits):
     st.markdown("### Exercise Benefits")
@@ -65,7 +83,7 @@ if app_mode == "About":
         with st.container():
             image_column, text_column = st.columns((1, 2))
             with image_column:
-                st.image(tutorial["image"], use_container_width=True)  # Updated parameter
+                show_media(tutorial["image"], sizes="(max-width: 640px) 100vw, 33vw")
             with text_column:
                 st.subheader(tutorial["title"])
                 st.write(f"Watch this tutorial to learn {tutorial['title']}!")
@@ -126,7 +144,7 @@ else:
     if app_mode in exercise_info:
         exercise = exercise_info[app_mode]
         st.markdown(f"## {app_mode}")
-        st.image(exercise["image"], caption=f"{app_mode} Demonstration", use_container_width=True)  # Updated parameter
+        show_media(exercise["image"], animated=True, caption=f"{app_mode} Demonstration", sizes="(max-width: 480px) 100vw, 480px")
         st.markdown(f"### Here's a step-by-step guide for {app_mode}:")
         st.write("\n".join([f"{i+1}. {step}" for i, step in enumerate(exercise["steps"])]))
         exercise_benefits(exercise["benefits"])
@@ -1,7 +1,10 @@
 import streamlit as st
-import time
+import streamlit.components.v1 as components
 import os
 
+from fitsphere import health
+from fitsphere.timer import countdown_html, start_timer, stop_timer, time_remaining
+
 # ---- CONFIGURE PAGE ----
 st.set_page_config(page_title="Utils", page_icon="🛠️", layout="wide")
 
@@ -20,17 +23,18 @@ st.write("## BMI Calculator 🧮")
 weight = st.number_input("Enter your weight (kg):", min_value=1, max_value=300, value=70)
 height = st.number_input("Enter your height (cm):", min_value=50, max_value=250, value=170)
 
+BMI_ADVICE = {
+    "underweight": "Consider consulting a healthcare provider.",
+    "normal weight": "Great job!",
+    "overweight": "Keep an eye on your health.",
+    "obese": "Consider a fitness plan.",
+}
+
 if st.button("Calculate BMI"):
-    bmi = weight / ((height / 100) ** 2)
+    bmi = float(health.bmi(weight, height))
+    category = str(health.bmi_category(bmi))
     st.write(f"Your BMI is **{bmi:.2f}**.")
-    if bmi < 18.5:
-        st.write("You're classified as **underweight**. Consider consulting a healthcare provider.")
-    elif 18.5 <= bmi < 24.9:
-        st.write("You're classified as **normal weight**. Great job!")
-    elif 25 <= bmi < 29.9:
-        st.write("You're classified as **overweight**. Keep an eye on your health.")
-    else:
-        st.write("You're classified as **obese**. Consider a fitness plan.")
+    st.write(f"You're classified as **{category}**. {BMI_ADVICE[category]}")
 
 # ---- CALORIE NEEDS CALCULATOR ----
 st.write("## Calorie Needs Calculator 🍎")
@@ -38,43 +42,26 @@ st.write("Estimate your daily calorie requirements based on your activity level.
 
 age = st.number_input("Enter your age:", min_value=1, max_value=120, value=25)
 gender = st.radio("Select your gender:", ["Male", "Female"])
-activity_level = st.selectbox(
-    "Select your activity level:",
-    [
-        "Sedentary (little or no exercise)",
-        "Lightly active (light exercise/sports 1-3 days/week)",
-        "Moderately active (moderate exercise/sports 3-5 days/week)",
-        "Very active (hard exercise/sports 6-7 days/week)",
-        "Extra active (very hard exercise, physical job, or training)",
-    ],
-)
+activity_level = st.selectbox("Select your activity level:", list(health.ACTIVITY_LEVELS))
 
 if st.button("Calculate Calories"):
-    bmr = 10 * weight + 6.25 * height - 5 * age + (5 if gender == "Male" else -161)
-    activity_multiplier = {
-        "Sedentary (little or no exercise)": 1.2,
-        "Lightly active (light exercise/sports 1-3 days/week)": 1.375,
-        "Moderately active (moderate exercise/sports 3-5 days/week)": 1.55,
-        "Very active (hard exercise/sports 6-7 days/week)": 1.725,
-        "Extra active (very hard exercise, physical job, or training)": 1.9,
-    }
-    calories = bmr * activity_multiplier[activity_level]
+    calories = float(health.daily_calories(weight, height, age, gender, activity_level))
     st.write(f"Your estimated daily calorie requirement is **{calories:.2f} kcal**.")
 
 # ---- WORKOUT TIMER WITH COUNTDOWN ----
 st.write("## Workout Timer ⏱️")
 st.write("Set a timer for your workouts (e.g., HIIT, yoga, or stretching).")
 timer_minutes = st.number_input("Set timer (minutes):", min_value=1, max_value=60, value=5)
-if st.button("Start Timer"):
-    st.write(f"Countdown Timer for **{timer_minutes} minutes**:")
-    countdown_seconds = timer_minutes * 60
+start_col, stop_col = st.columns(2)
+if start_col.button("Start Timer"):
+    start_timer(st.session_state, "workout_timer", timer_minutes * 60)
+if stop_col.button("Stop Timer"):
+    stop_timer(st.session_state, "workout_timer")
 
-    with st.empty():
-        for seconds_left in range(countdown_seconds, -1, -1):
-            minutes, seconds = divmod(seconds_left, 60)
-            st.write(f"Time Remaining: **{minutes:02}:{seconds:02}**")
-            time.sleep(1)
-    st.success("Time's up! Great job on your workout!")
+# The countdown runs in the browser; the script only remembers when it ends.
+seconds_left = time_remaining(st.session_state, "workout_timer")
+if seconds_left is not None:
+    components.html(countdown_html(seconds_left, "Time's up! Great job on your workout!"), height=60)
 
 # ---- WATER INTAKE CALCULATOR ----
 st.write("## Daily Water Intake Calculator 💧")
@@ -82,9 +69,32 @@ st.write("Calculate how much water you should drink daily based on your weight."
 water_weight = st.number_input("Enter your weight (kg) for water calculation:", min_value=1, max_value=300, value=70)
 
 if st.button("Calculate Water Intake"):
-    water_intake = water_weight * 0.033
+    water_intake = float(health.water_intake(water_weight))
     st.write(f"Your recommended daily water intake is **{water_intake:.2f} liters**.")
 
+# ---- BULK MEMBER METRICS ----
+st.write("## Bulk Member Metrics 👥")
+st.write(
+    "Upload a roster (CSV or Parquet) with columns "
+    + ", ".join(f"`{col}`" for col in health.ROSTER_COLUMNS)
+    + " to compute everyone's BMI, calorie needs and water intake at once."
+)
+roster_file = st.file_uploader("Upload member roster", type=["csv", "parquet"])
+if roster_file is not None:
+    try:
+        metrics = health.compute_metrics(health.load_roster(roster_file, roster_file.name))
+    except (ValueError, ImportError) as e:
+        st.error(str(e))
+    else:
+        st.write(f"Computed metrics for **{len(metrics)}** members.")
+        st.dataframe(metrics.head(100), hide_index=True)
+        st.download_button(
+            label="Download Member Metrics",
+            data=metrics.to_csv(index=False).encode("utf-8"),
+            file_name="member_metrics.csv",
+            mime="text/csv",
+        )
+
 # ---- EXTERNAL RESOURCES ----
 st.write("## External Fitness Resources 🌐")
 st.markdown(
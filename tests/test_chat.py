@@ -0,0 +1,74 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fitsphere.chat import ChatClient, ChatError
+
+
+def _event(content):
+    return f"data: {json.dumps({'choices': [{'delta': {'content': content}}]})}\n\n"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mode = "ok"
+
+    def log_message(self, *args):
+        pass
+
+    def _chunk(self, text):
+        data = text.encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._chunk(_event("Hello"))
+        if self.mode == "truncated":
+            self.wfile.write(b"40\r\ndata: {\"choi")  # chunk cut short, then the connection drops
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        if self.mode == "bad_json":
+            self._chunk("data: {not json}\n\n")
+        else:
+            self._chunk(_event(" there"))
+        self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(server, mode):
+    StubHandler.mode = mode
+    return ChatClient("test-key", base_url=f"http://127.0.0.1:{server.server_port}/v1", read_timeout=5.0)
+
+
+def test_stream_yields_deltas(server):
+    assert _client(server, "ok").complete([{"role": "user", "content": "hi"}]) == "Hello there"
+
+
+def test_truncated_stream_raises_chat_error(server):
+    tokens = []
+    with pytest.raises(ChatError, match="interrupted"):
+        for token in _client(server, "truncated").stream([{"role": "user", "content": "hi"}]):
+            tokens.append(token)
+    assert tokens == ["Hello"]
+
+
+def test_bad_json_chunk_raises_chat_error(server):
+    with pytest.raises(ChatError, match="Malformed"):
+        _client(server, "bad_json").complete([{"role": "user", "content": "hi"}])